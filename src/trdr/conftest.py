@@ -1,9 +1,15 @@
 import asyncio
 import pytest
+from pytest_asyncio import is_async_test
 import yfinance as yf
 import random
 import datetime
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
 from .core.security_provider.security_provider import SecurityProvider
 from .core.bar_provider.yf_bar_provider.yf_bar_provider import YFBarProvider
 from .test_utils.fake_yf_download import fake_yf_download
@@ -18,6 +24,22 @@ from .core.trading_context.trading_context import TradingContext
 from .core.shared.models import TradingDateTime
 
 
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Use uvloop's faster scheduler for the async tests when it is installed."""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on the session-wide event loop, so the loop is created once per session."""
+    session_loop_marker = pytest.mark.asyncio(loop_scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_loop_marker, append=False)
+
+
 @pytest.fixture(scope="function")
 def weekday_trading_datetime():
     trading_now = TradingDateTime.now()
@@ -35,15 +57,15 @@ def weekend_trading_datetime():
 
 
 @pytest.fixture(scope="function")
-def yf_bar_provider_with_fake_data(monkeypatch):
+async def yf_bar_provider_with_fake_data(monkeypatch):
     monkeypatch.setattr(yf, "download", fake_yf_download)
     monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "YFTzMissingError()", "AMZN": "JSONDecodeError()"})
-    return asyncio.run(YFBarProvider.create(["AAPL", "MSFT", "ABCDEFG", "AMZN"]))
+    return await YFBarProvider.create(["AAPL", "MSFT", "ABCDEFG", "AMZN"])
 
 
 @pytest.fixture(scope="function")
-def security_provider_with_fake_data(yf_bar_provider_with_fake_data):
-    return asyncio.run(SecurityProvider.create(yf_bar_provider_with_fake_data))
+async def security_provider_with_fake_data(yf_bar_provider_with_fake_data):
+    return await SecurityProvider.create(yf_bar_provider_with_fake_data)
 
 
 @pytest.fixture(scope="function")
@@ -102,34 +124,49 @@ def dummy_positions():
     return positions
 
 
-@pytest.fixture(scope="function")
-def mock_broker_with_nun_strategy():
+@pytest.fixture(scope="session")
+async def mock_broker_template_with_nun_strategy():
     nun_strategy = NunStrategy.create()
-    broker = asyncio.run(MockBroker.create(pdt_strategy=nun_strategy))
+    broker = await MockBroker.create(pdt_strategy=nun_strategy)
     yield broker
-    asyncio.run(broker._session.close())
+    await broker._session.close()
 
 
-@pytest.fixture(scope="function")
-def mock_broker_with_wiggle_strategy():
+@pytest.fixture(scope="session")
+async def mock_broker_template_with_wiggle_strategy():
     pdt_strategy = WiggleStrategy.create()
     pdt_strategy.wiggle_room = 2
-    broker = asyncio.run(MockBroker.create(pdt_strategy=pdt_strategy))
+    broker = await MockBroker.create(pdt_strategy=pdt_strategy)
     yield broker
-    asyncio.run(broker._session.close())
+    await broker._session.close()
 
 
-@pytest.fixture(scope="function")
-def mock_broker_with_yolo_strategy():
+@pytest.fixture(scope="session")
+async def mock_broker_template_with_yolo_strategy():
     pdt_strategy = YoloStrategy.create()
-    broker = asyncio.run(MockBroker.create(pdt_strategy=pdt_strategy))
+    broker = await MockBroker.create(pdt_strategy=pdt_strategy)
     yield broker
-    asyncio.run(broker._session.close())
+    await broker._session.close()
+
+
+@pytest.fixture(scope="function")
+async def mock_broker_with_nun_strategy(mock_broker_template_with_nun_strategy):
+    return await mock_broker_template_with_nun_strategy.clone()
+
+
+@pytest.fixture(scope="function")
+async def mock_broker_with_wiggle_strategy(mock_broker_template_with_wiggle_strategy):
+    return await mock_broker_template_with_wiggle_strategy.clone()
+
+
+@pytest.fixture(scope="function")
+async def mock_broker_with_yolo_strategy(mock_broker_template_with_yolo_strategy):
+    return await mock_broker_template_with_yolo_strategy.clone()
 
 
 @pytest.fixture(scope="function")
-def mock_trading_context(security_provider_with_fake_data, mock_broker_with_nun_strategy):
-    return asyncio.run(TradingContext.create(security_provider_with_fake_data, mock_broker_with_nun_strategy))
+async def mock_trading_context(security_provider_with_fake_data, mock_broker_with_nun_strategy):
+    return await TradingContext.create(security_provider_with_fake_data, mock_broker_with_nun_strategy)
 
 
 @pytest.fixture(scope="function")
@@ -142,7 +179,7 @@ def create_order():
 
 
 @pytest.fixture(scope="function")
-def prepared_trading_context(mock_trading_context: TradingContext):
+async def prepared_trading_context(mock_trading_context: TradingContext):
     """Prepare trading context with a valid symbol and security."""
-    asyncio.run(mock_trading_context.next_symbol())
+    await mock_trading_context.next_symbol()
     return mock_trading_context
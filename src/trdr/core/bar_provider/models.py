@@ -5,6 +5,9 @@ from .exceptions import BarValidationException
 
 
 class Bar(BaseModel):
+    # See Money: fields live in pydantic's __dict__, this only drops the per-instance __weakref__ slot.
+    __slots__ = ()
+
     trading_datetime: TradingDateTime
     open: Money
     high: Money
@@ -14,14 +17,17 @@ class Bar(BaseModel):
 
     @model_validator(mode="after")
     def check_values(self) -> "Bar":
+        # Runs for every bar ingested, so each amount is read once.
+        low = self.low.amount
+        high = self.high.amount
         # Validate that the low price is less than or equal to high price.
-        if self.low.amount > self.high.amount:
+        if low > high:
             raise BarValidationException("Low price must be less than or equal to high price")
         # Validate that open price is between low and high.
-        if not (self.low.amount <= self.open.amount <= self.high.amount):
+        if not (low <= self.open.amount <= high):
             raise BarValidationException("Open price must be between low and high prices")
         # Validate that close price is between low and high.
-        if not (self.low.amount <= self.close.amount <= self.high.amount):
+        if not (low <= self.close.amount <= high):
             raise BarValidationException("Close price must be between low and high prices")
         # Validate that the volume is non-negative.
         if self.volume < 0:
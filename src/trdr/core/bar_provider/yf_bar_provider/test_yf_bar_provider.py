@@ -1,8 +1,10 @@
+from datetime import datetime, timezone
+
+import pandas as pd
 import pytest
-import asyncio
 import yfinance as yf
 
-from .yf_bar_provider import YFBarProvider
+from .yf_bar_provider import YFBarProvider, _utc_datetimes
 from ..exceptions import NoBarsForSymbolException, BarProviderException, InsufficientBarsException
 from ....test_utils.fake_yf_download import fake_yf_download
 
@@ -27,47 +29,145 @@ def test_get_symbols_returns_only_symbols_that_have_bars(yf_bar_provider_with_fa
     assert actual_symbols == expected_symbols
 
 
-def test_gets_bars_throws_exception_when_no_bars_are_available_for_a_symbol(yf_bar_provider_with_fake_data):
+async def test_gets_bars_throws_exception_when_no_bars_are_available_for_a_symbol(yf_bar_provider_with_fake_data):
     with pytest.raises(NoBarsForSymbolException):
-        bars = asyncio.run(yf_bar_provider_with_fake_data.get_bars("ABCDEFG"))
+        bars = await yf_bar_provider_with_fake_data.get_bars("ABCDEFG")
 
 
-def test_get_bars_throws_exception_when_symbol_is_not_in_data_cache(yf_bar_provider_with_fake_data):
+async def test_get_bars_throws_exception_when_symbol_is_not_in_data_cache(yf_bar_provider_with_fake_data):
     with pytest.raises(NoBarsForSymbolException):
-        bars = asyncio.run(yf_bar_provider_with_fake_data.get_bars("ABCDEFG"))
+        bars = await yf_bar_provider_with_fake_data.get_bars("ABCDEFG")
 
 
-def test_provider_throws_exception_when_data_source_returns_error(monkeypatch):
+async def test_provider_throws_exception_when_data_source_returns_error(monkeypatch):
     # ensure we raise an exception when the data source returns an error that is not a missing symbol error
     with pytest.raises(BarProviderException):
         monkeypatch.setattr(yf, "download", fake_yf_download)
         monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "RandomYFError()"})
-        bars = asyncio.run(YFBarProvider.create(["ABCDEFG"]))
+        bars = await YFBarProvider.create(["ABCDEFG"])
 
 
-def test_get_bars_throws_exception_when_lookback_is_greater_than_the_number_of_bars_available(
+async def test_get_bars_throws_exception_when_lookback_is_greater_than_the_number_of_bars_available(
     yf_bar_provider_with_fake_data,
 ):
     with pytest.raises(InsufficientBarsException):
-        bars = asyncio.run(yf_bar_provider_with_fake_data.get_bars("AAPL", 7))
+        bars = await yf_bar_provider_with_fake_data.get_bars("AAPL", 7)
 
 
-def test_get_current_bar_throws_exception_when_no_bars_are_available_for_a_symbol(monkeypatch):
+async def test_get_current_bar_throws_exception_when_no_bars_are_available_for_a_symbol(monkeypatch):
     with pytest.raises(NoBarsForSymbolException):
         """
         Any time yf.download() is called, we clear the yf.shared._ERRORS dictionary after we are done inspecting it. Therefore, when we call yf.download() in the get_current_bar() method, we need to set the yf.shared._ERRORS dictionary again to the expected value of the test.
         """
         monkeypatch.setattr(yf, "download", fake_yf_download)
         monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "YFTzMissingError()"})
-        yf_bar_provider = asyncio.run(YFBarProvider.create(["ABCDEFG"]))
+        yf_bar_provider = await YFBarProvider.create(["ABCDEFG"])
         # yf.shared._ERRORS is currently {} as we reset it after the yf.download() call that occurs during initialization of the bar provider.
         monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "YFTzMissingError()"})
-        bar = asyncio.run(yf_bar_provider.get_current_bar("ABCDEFG"))
+        bar = await yf_bar_provider.get_current_bar("ABCDEFG")
 
 
-def test_get_current_bar_throws_exception_when_data_source_returns_error(monkeypatch):
+async def test_get_current_bar_throws_exception_when_data_source_returns_error(monkeypatch):
     with pytest.raises(BarProviderException):
         monkeypatch.setattr(yf, "download", fake_yf_download)
-        yf_bar_provider = asyncio.run(YFBarProvider.create(["ABCDEFG"]))
+        yf_bar_provider = await YFBarProvider.create(["ABCDEFG"])
         monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "RandomYFError()"})
-        bar = asyncio.run(yf_bar_provider.get_current_bar("ABCDEFG"))
+        bar = await yf_bar_provider.get_current_bar("ABCDEFG")
+
+
+async def test_bars_are_built_from_the_downloaded_columns_in_order(yf_bar_provider_with_fake_data):
+    bars = await yf_bar_provider_with_fake_data.get_bars("MSFT")
+    assert [bar.open.amount for bar in bars] == [200, 201, 202, 203, 204]
+    assert [bar.close.amount for bar in bars] == [205, 206, 207, 208, 209]
+    assert [bar.volume for bar in bars] == [2000, 2100, 2200, 2300, 2400]
+
+
+async def test_symbol_with_nan_prices_is_dropped_from_the_data_cache(monkeypatch):
+    def fake_yf_download_with_nan(*args, **kwargs):
+        data = fake_yf_download(*args, **kwargs)
+        data.loc[data.index[0], ("AAPL", "Open")] = float("nan")
+        return data
+
+    monkeypatch.setattr(yf, "download", fake_yf_download_with_nan)
+    monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "YFTzMissingError()", "AMZN": "JSONDecodeError()"})
+    yf_bar_provider = await YFBarProvider.create(["AAPL", "MSFT", "ABCDEFG", "AMZN"])
+    assert set(yf_bar_provider.get_symbols()) == {"MSFT"}
+
+
+async def test_batch_download_is_served_from_the_disk_cache_when_enabled(monkeypatch, tmp_path):
+    download_calls = []
+
+    def counting_fake_yf_download(*args, **kwargs):
+        download_calls.append(args)
+        return fake_yf_download(*args, **kwargs)
+
+    monkeypatch.setenv("TRDR_YF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(yf, "download", counting_fake_yf_download)
+    monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "YFTzMissingError()"})
+    first = await YFBarProvider.create(["AAPL", "MSFT", "ABCDEFG"])
+    second = await YFBarProvider.create(["MSFT", "AAPL", "ABCDEFG"])
+
+    assert len(download_calls) == 1
+    assert set(second.get_symbols()) == set(first.get_symbols()) == {"AAPL", "MSFT"}
+    assert await second.get_bars("AAPL") == await first.get_bars("AAPL")
+
+
+async def test_rate_limited_download_is_not_cached(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRDR_YF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(yf, "download", fake_yf_download)
+    monkeypatch.setattr(yf.shared, "_ERRORS", {"AMZN": "JSONDecodeError()"})
+    await YFBarProvider.create(["AAPL", "MSFT", "AMZN"])
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_download_errors_are_cleared_even_when_get_current_bar_raises(monkeypatch):
+    monkeypatch.setattr(yf, "download", fake_yf_download)
+    yf_bar_provider = await YFBarProvider.create(["AAPL"])
+    monkeypatch.setattr(yf.shared, "_ERRORS", {"ABCDEFG": "YFTzMissingError()"})
+    with pytest.raises(NoBarsForSymbolException):
+        await yf_bar_provider.get_current_bar("ABCDEFG")
+    assert yf.shared._ERRORS == {}
+
+
+async def test_get_bars_returns_the_most_recent_bars_for_a_lookback(yf_bar_provider_with_fake_data):
+    bars = await yf_bar_provider_with_fake_data.get_bars("AAPL", 2)
+    assert [bar.close.amount for bar in bars] == [108, 109]
+    assert await yf_bar_provider_with_fake_data.get_bars("AAPL", 0) == []
+
+
+def test_utc_datetimes_labels_exchange_local_times_as_utc():
+    index = pd.DatetimeIndex(["2025-01-10 09:30"]).tz_localize("America/New_York")
+    assert list(_utc_datetimes(index)) == [datetime(2025, 1, 10, 9, 30, tzinfo=timezone.utc)]
+
+
+async def test_repeated_symbols_are_downloaded_once(monkeypatch):
+    requested = []
+
+    def recording_fake_yf_download(symbols, *args, **kwargs):
+        requested.append(list(symbols))
+        return fake_yf_download(symbols, *args, **kwargs)
+
+    monkeypatch.setattr(yf, "download", recording_fake_yf_download)
+    await YFBarProvider.create(["MSFT", "AAPL", "MSFT"])
+    assert requested == [["MSFT", "AAPL"]]
+
+
+def test_download_cache_entries_expire_within_the_day(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRDR_YF_CACHE_DIR", str(tmp_path))
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    morning = YFBarProvider._download_cache_path(["AAPL"], start, datetime(2025, 6, 2, 14, 5, tzinfo=timezone.utc))
+    same_hour = YFBarProvider._download_cache_path(["AAPL"], start, datetime(2025, 6, 2, 14, 55, tzinfo=timezone.utc))
+    after_close = YFBarProvider._download_cache_path(["AAPL"], start, datetime(2025, 6, 2, 21, 0, tzinfo=timezone.utc))
+    assert morning == same_hour
+    assert morning != after_close
+
+
+def test_download_cache_writes_leave_no_temporary_files(tmp_path):
+    path = tmp_path / "cache" / "entry.pkl"
+    data = pd.DataFrame({"Close": [1.0]})
+    YFBarProvider._write_download_cache(path, ["AAPL"], data)
+    YFBarProvider._write_download_cache(path, ["AAPL", "MSFT"], data)
+    assert list(path.parent.iterdir()) == [path]
+    symbols, cached = YFBarProvider._read_download_cache(path)
+    assert symbols == ["AAPL", "MSFT"]
+    assert cached.equals(data)
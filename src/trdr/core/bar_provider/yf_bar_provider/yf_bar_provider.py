@@ -1,7 +1,13 @@
-from typing import List, Tuple, Optional
-from datetime import timedelta, timezone
+from typing import Dict, List, Tuple, Optional, Sequence
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import asyncio
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
 import yfinance as yf
-from decimal import Decimal
 import pandas as pd
 from opentelemetry import trace
 import logging
@@ -15,11 +21,50 @@ from ..exceptions import (
 from ..base_bar_provider import BaseBarProvider
 from ..models import Bar, TradingDateTime, Money
 from ...shared.models import Timeframe
+from ...shared.tracing import start_span
 
 # Disable yfinance logging
 logger = logging.getLogger("yfinance")
 logger.disabled = True
 
+# Per-symbol price columns in a yf.download() frame, in the order Bars are built from them.
+_PRICE_FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+# Directory for caching batch downloads across runs; caching is off when unset. Entries are pickles, so it must be
+# a directory only trusted users can write to.
+_CACHE_DIR_ENV_VAR = "TRDR_YF_CACHE_DIR"
+# yfinance reports a rate limit as a JSONDecodeError; downloads that hit it are incomplete and not cached.
+_RATE_LIMIT_ERROR = "JSONDecodeError"
+
+# yf.download() gathers results and errors in module globals (yf.shared), so only one call may run at a time.
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def _download(*args, **kwargs) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Run yf.download() and return its data together with the per-symbol errors it reported.
+
+    Meant to run in a worker thread so the download does not block the event loop. The errors dictionary is
+    reset afterwards: the yf module is long lived, and stale errors would be read as belonging to the next call.
+    """
+    with _DOWNLOAD_LOCK:
+        data = yf.download(*args, **kwargs)
+        errors = yf.shared._ERRORS
+        yf.shared._ERRORS = {}
+    return data, errors
+
+
+def _utc_datetimes(index: pd.DatetimeIndex) -> Sequence[datetime]:
+    """
+    Convert a download's index to UTC-aware datetimes in one pass.
+
+    Wall-clock times are labelled UTC rather than converted, so an exchange-local intraday index keeps its
+    times as they were reported.
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.tz_localize(timezone.utc).to_pydatetime()
+
 
 class YFBarProvider(BaseBarProvider):
     def __init__(
@@ -45,7 +90,8 @@ class YFBarProvider(BaseBarProvider):
                 span.record_exception(e)
                 raise e
             try:
-                await self._refresh_data(symbols)
+                # Drop repeated symbols while keeping the caller's order; each is downloaded and converted once.
+                await self._refresh_data(list(dict.fromkeys(symbols)))
             except Exception as e:
                 span.add_event("refresh_data_error")
                 span.set_status(trace.Status(trace.StatusCode.ERROR))
@@ -70,12 +116,23 @@ class YFBarProvider(BaseBarProvider):
                 span.set_status(trace.Status(trace.StatusCode.ERROR))
                 raise e
             else:
+                if symbols_with_data:
+                    # One cross-section per price field across every symbol, rather than an xs() sub-frame per
+                    # symbol; each symbol's prices are then a column slice of the field's array.
+                    dates = _utc_datetimes(data.index)
+                    field_frames = [data.xs(field, level=1, axis=1) for field in _PRICE_FIELDS]
+                    field_arrays = [(frame.columns, frame.to_numpy()) for frame in field_frames]
+                bars_created = 0
                 for symbol in symbols_with_data:
                     try:
-                        symbol_data = data.xs(symbol, level=0, axis=1)
-                        bars = self._convert_df_to_bars(symbol, symbol_data)
+                        columns = [
+                            array[:, field_symbols.get_loc(symbol)].tolist() for field_symbols, array in field_arrays
+                        ]
+                        bars = self._convert_columns_to_bars(symbol, dates, *columns)
                         self._data_cache[symbol] = bars
+                        bars_created += len(bars)
                     except BarConversionException as e:
+                        span.add_event("symbol_failed_to_convert", {"symbol": symbol, "error": str(e)})
                         continue
                     except Exception as e:
                         span.set_status(trace.Status(trace.StatusCode.ERROR))
@@ -85,6 +142,7 @@ class YFBarProvider(BaseBarProvider):
                     len(symbols_with_data) - len(self._data_cache.keys()),
                 )
                 span.set_attribute("number_of_symbols_with_data", len(self._data_cache.keys()))
+                span.set_attribute("bars_created", bars_created)
                 span.set_status(trace.Status(trace.StatusCode.OK))
                 span.add_event("refresh_complete")
 
@@ -105,34 +163,44 @@ class YFBarProvider(BaseBarProvider):
             span.set_attribute("start_datetime", str(start_datetime))
             span.set_attribute("end_datetime", str(end_datetime))
             span.set_attribute("date_range_days", (end_datetime - start_datetime).days)
+            cache_path = self._download_cache_path(symbols, start_datetime, end_datetime)
+            if cache_path is not None and cache_path.exists():
+                span.add_event("download_cache_hit")
+                span.set_status(trace.Status(trace.StatusCode.OK))
+                return await asyncio.to_thread(self._read_download_cache, cache_path)
+            rate_limited = False
             span.add_event("begin_data_fetch")
-            data = yf.download(
+            # One batch call: yfinance already fetches the symbols concurrently on its own threads.
+            data, errors = await asyncio.to_thread(
+                _download,
                 symbols,
                 start=start_datetime,
                 end=end_datetime,
                 group_by="ticker",
+                progress=False,
                 interval=Timeframe.d1.to_yf_interval(),
             )
             span.add_event("data_fetch_complete")
-            if yf.shared._ERRORS:
+            if errors:
                 """
-                If a symbol has one of the following errors associated with it in the yf.shared._ERRORS dictionary, it means that we received no data for that symbol. We should therefore remove it from self._symbols.
+                If a symbol has one of the following errors associated with it in the errors dictionary, it means that we received no data for that symbol. We should therefore remove it from self._symbols.
                 The JSONDecodeError is the manifestation of a rate limit.
                 """
 
                 symbols_with_no_data = [
                     symbol
-                    for symbol, error in yf.shared._ERRORS.items()
+                    for symbol, error in errors.items()
                     if any(no_data_error in error for no_data_error in self._no_data_errors)
                 ]
                 for symbol in symbols_with_no_data:
                     if symbol in symbols:
                         symbols.remove(symbol)
+                rate_limited = any(_RATE_LIMIT_ERROR in error for error in errors.values())
 
                 # Gather any other errors.
                 other_errors = [
                     error
-                    for error in yf.shared._ERRORS.values()
+                    for error in errors.values()
                     if all(no_data_error not in error for no_data_error in self._no_data_errors)
                 ]
                 if other_errors:
@@ -146,13 +214,52 @@ class YFBarProvider(BaseBarProvider):
                     if symbols_with_no_data:
                         span.set_attribute("symbols_with_no_data", symbols_with_no_data)
 
-                """
-                Our yf object is long lived across the lifetime of the bar provider. Therefore, we should reset the errors dictionary. We need it clean as we will need to inspect errors produced by calls to yf.download()
-                """
-                yf.shared._ERRORS = {}
-
+            if cache_path is not None and not rate_limited:
+                await asyncio.to_thread(self._write_download_cache, cache_path, symbols, data)
+                span.add_event("download_cached")
             return symbols, data
 
+    @staticmethod
+    def _download_cache_path(symbols: List[str], start: datetime, end: datetime) -> Optional[Path]:
+        """
+        Return where the daily download for these symbols and dates is cached, or None if caching is off.
+
+        The key holds the start date and the end time to the hour. A download taken while a session is open ends
+        in that day's partial bar, so runs share an entry only within the hour rather than for the rest of the day.
+        """
+        cache_dir = os.getenv(_CACHE_DIR_ENV_VAR)
+        if not cache_dir:
+            return None
+        key = repr(
+            (sorted(symbols), start.date().isoformat(), end.strftime("%Y-%m-%dT%H"), Timeframe.d1.to_yf_interval())
+        )
+        return Path(cache_dir) / f"{hashlib.sha1(key.encode()).hexdigest()}.pkl"
+
+    @staticmethod
+    def _read_download_cache(path: Path) -> Tuple[List[str], pd.DataFrame]:
+        """
+        Load a cached download.
+
+        Entries are pickles, and unpickling can run arbitrary code: the cache directory must be writable only by
+        users trusted to run code as this process.
+        """
+        with path.open("rb") as f:
+            return pickle.load(f)
+
+    @staticmethod
+    def _write_download_cache(path: Path, symbols: List[str], data: pd.DataFrame) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a file of our own, then rename, so neither a concurrent reader nor a concurrent writer of the same
+        # entry ever sees a partial file.
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.stem, suffix=".tmp", delete=False) as f:
+            try:
+                pickle.dump((symbols, data), f)
+            except BaseException:
+                f.close()
+                os.unlink(f.name)
+                raise
+        os.replace(f.name, path)
+
     def _convert_df_to_bars(self, symbol: str, df: pd.DataFrame) -> List[Bar]:
         """
         Convert a DataFrame to a list of Bar objects.
@@ -163,40 +270,56 @@ class YFBarProvider(BaseBarProvider):
         Returns:
             List[Bar]: List of Bar objects.
         """
-        with self._tracer.start_as_current_span("YFBarProvider._convert_df_to_bars") as span:
-            span.set_attribute("symbol", symbol)
+        try:
+            columns = [df[field].to_numpy().tolist() for field in _PRICE_FIELDS]
+        except KeyError as e:
+            raise BarConversionException(f"missing price columns for {symbol}") from e
+        return self._convert_columns_to_bars(symbol, _utc_datetimes(df.index), *columns)
 
-            bars = []
-            total_rows = len(df)
-            bar_creation_errors = 0
-
-            for date, row in df.iterrows():
-                try:
-                    utc_timestamp = pd.Timestamp(date).to_pydatetime().replace(tzinfo=timezone.utc)
-                    bar = Bar(
-                        trading_datetime=TradingDateTime.from_utc(utc_timestamp),
-                        open=Money(amount=Decimal(float(row["Open"]))),
-                        high=Money(amount=Decimal(float(row["High"]))),
-                        low=Money(amount=Decimal(float(row["Low"]))),
-                        close=Money(amount=Decimal(float(row["Close"]))),
-                        volume=int(row["Volume"]),
-                    )
-                    bars.append(bar)
-                except Exception as lower_e:
-                    bar_creation_errors += 1
-                    if bar_creation_errors / total_rows > 0.05:
-                        span.set_status(trace.Status(trace.StatusCode.ERROR))
-                        e = BarConversionException(
-                            f"failed to convert {bar_creation_errors} out of {total_rows} rows to Bars"
-                        )
-                        span.set_attribute("exception.cause", lower_e)
-                        span.record_exception(e)
-                        raise e from lower_e
-            span.set_attribute("bars_created", len(bars))
-            span.set_attribute("bar_creation_errors", bar_creation_errors)
-            span.set_status(trace.Status(trace.StatusCode.OK))
+    def _convert_columns_to_bars(
+        self,
+        symbol: str,
+        dates: Sequence[datetime],
+        opens: Sequence[float],
+        highs: Sequence[float],
+        lows: Sequence[float],
+        closes: Sequence[float],
+        volumes: Sequence[float],
+    ) -> List[Bar]:
+        """
+        Convert parallel date and price columns to a list of Bar objects.
 
-            return bars
+        The dates must be UTC-aware, as produced by _utc_datetimes.
+
+        Returns:
+            List[Bar]: List of Bar objects.
+
+        Raises:
+            BarConversionException: If more than 5% of the rows fail to convert.
+        """
+        # No span of its own: this runs once per symbol, so _refresh_data reports the totals and any failures.
+        bars = []
+        total_rows = len(dates)
+        bar_creation_errors = 0
+
+        for date, open_, high, low, close, volume in zip(dates, opens, highs, lows, closes, volumes):
+            try:
+                bar = Bar(
+                    trading_datetime=TradingDateTime.from_utc(date),
+                    open=Money.from_float(float(open_)),
+                    high=Money.from_float(float(high)),
+                    low=Money.from_float(float(low)),
+                    close=Money.from_float(float(close)),
+                    volume=int(volume),
+                )
+                bars.append(bar)
+            except Exception as e:
+                bar_creation_errors += 1
+                if bar_creation_errors / total_rows > 0.05:
+                    raise BarConversionException(
+                        f"failed to convert {bar_creation_errors} out of {total_rows} rows to Bars for {symbol}"
+                    ) from e
+        return bars
 
     def get_symbols(self) -> List[str]:
         return list(self._data_cache.keys())
@@ -205,22 +328,23 @@ class YFBarProvider(BaseBarProvider):
         with self._tracer.start_as_current_span("YFBarProvider.get_current_bar") as span:
             span.set_attribute("symbol", symbol)
             span.add_event("begin_current_bar_data_fetch")
-            data = yf.download(
+            data, errors = await asyncio.to_thread(
+                _download,
                 symbol,
                 period=Timeframe.d1.to_yf_interval(),
                 interval=Timeframe.m15.to_yf_interval(),
                 group_by="ticker",
+                progress=False,
             )
             span.add_event("current_bar_data_fetch_complete")
-            if yf.shared._ERRORS:
-                error = yf.shared._ERRORS.get(symbol, None)
+            if errors:
+                error = errors.get(symbol, None)
                 if not error or not any(no_data_error in error for no_data_error in self._no_data_errors):
                     """
                     If we receive an error not associated with the symbol of interest, we should raise an exception.
                     """
                     # Gather any other errors.
-                    errors = [error for error in yf.shared._ERRORS.values()]
-                    error_msg = "; ".join(errors)
+                    error_msg = "; ".join(errors.values())
                     span.set_status(trace.Status(trace.StatusCode.ERROR))
                     e = BarProviderException(f"Received an error not related to no data errors: {error_msg}")
                     span.record_exception(e)
@@ -233,10 +357,6 @@ class YFBarProvider(BaseBarProvider):
                     e = NoBarsForSymbolException(f"{symbol}")
                     span.record_exception(e)
                     raise e
-                """
-                Our yf object is long lived across the lifetime of the bar provider. Therefore, we should reset the errors dictionary. We need it clean as we will need to inspect errors produced by calls to yf.download()
-                """
-                yf.shared._ERRORS = {}
 
             try:
                 symbol_data = data.xs(symbol, level=0, axis=1)
@@ -269,33 +389,28 @@ class YFBarProvider(BaseBarProvider):
             NoBarsForSymbolException: If we didn't receive any data for the symbol of interest.
             InsufficientBarsException: If the number of bars requested is greater than the number of bars available.
         """
-        with self._tracer.start_as_current_span("YFBarProvider.get_bars") as span:
+        with start_span(self._tracer, "YFBarProvider.get_bars") as span:
             span.set_attribute("symbol", symbol)
             if lookback is not None:
                 span.set_attribute("requested_lookback", lookback)
-            if not self._data_cache.get(symbol, None):
+            cached_bars = self._data_cache.get(symbol, None)
+            if not cached_bars:
                 span.add_event("no_data_found_for_symbol")
                 span.set_status(trace.Status(trace.StatusCode.ERROR))
                 e = NoBarsForSymbolException(symbol)
                 span.record_exception(e)
                 raise e
+            available = len(cached_bars)
             if lookback is None:
-                lookback = len(self._data_cache[symbol])
-            if len(self._data_cache[symbol]) < lookback:
-                span.set_attribute("lookback_available_for_symbol", len(self._data_cache[symbol]))
+                lookback = available
+            if available < lookback:
+                span.set_attribute("lookback_available_for_symbol", available)
                 span.add_event("lookback_too_large_for_symbol")
                 span.set_status(trace.Status(trace.StatusCode.ERROR))
-                e = InsufficientBarsException(
-                    f"Only {len(self._data_cache[symbol])} bars available for symbol: {symbol}"
-                )
+                e = InsufficientBarsException(f"Only {available} bars available for symbol: {symbol}")
                 span.record_exception(e)
                 raise e
-            try:
-                bars = self._data_cache[symbol][-lookback:]
-            except Exception as e:
-                span.set_status(trace.Status(trace.StatusCode.ERROR))
-                span.record_exception(e)
-                raise
-            else:
-                span.set_status(trace.Status(trace.StatusCode.OK))
-                return bars
+            # Slice from an explicit start index: [-lookback:] would return every bar for a lookback of 0.
+            bars = cached_bars[available - lookback :]
+            span.set_status(trace.Status(trace.StatusCode.OK))
+            return bars
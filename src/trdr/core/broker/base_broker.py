@@ -1,20 +1,28 @@
 from abc import ABC, abstractmethod
+import asyncio
+import inspect
+import time
+import types
 import aiohttp
-from typing import Optional, Type, TypeVar, Dict
+from datetime import date
+from typing import Awaitable, Mapping, Optional, Tuple, Type, TypeVar, Dict
 from opentelemetry import trace
 from opentelemetry.trace import NoOpTracer
 from decimal import Decimal
-from datetime import timedelta
 
-from .models import Order, Position
+from .models import Order, OrderSide, Position, PositionSide
 from ..bar_provider.models import Bar
 from ..shared.models import Money, TradingDateTime
 from .pdt.base_pdt_strategy import BasePDTStrategy
 from .pdt.models import PDTContext
 from .pdt.exceptions import PDTRuleViolationException
+from ..shared.tracing import start_span
 
 T = TypeVar("T", bound="BaseBroker")
 
+# Broker state older than this many seconds is considered stale and is refreshed on next access.
+STALE_AFTER_SECONDS = 600.0
+
 
 class BaseBroker(ABC):
     """
@@ -40,9 +48,29 @@ class BaseBroker(ABC):
         _equity: Total account value (cash + positions)
         _day_trade_count: Number of day trades in the rolling 5-day window
         _updated_dt: Timestamp of the last data refresh
+        _last_refresh_monotonic: Monotonic clock reading taken at the last data refresh
         _is_stale_flag: Flag indicating if data needs refreshing
+        _refresh_future: The in-flight refresh shared by concurrent callers, if any
+        _opened_today_cache: Memoized position_opened_today results keyed by (symbol, trading date)
+        _account_exposure: Memoized get_account_exposure result, valid until the next refresh
     """
 
+    __slots__ = (
+        "_session",
+        "_pdt_strategy",
+        "_tracer",
+        "_positions",
+        "_cash",
+        "_equity",
+        "_day_trade_count",
+        "_updated_dt",
+        "_last_refresh_monotonic",
+        "_is_stale_flag",
+        "_refresh_future",
+        "_opened_today_cache",
+        "_account_exposure",
+    )
+
     def __init__(self, pdt_strategy: BasePDTStrategy, tracer: trace.Tracer):
         """Initialize the broker with pattern day trading strategy and tracer support.
 
@@ -53,12 +81,16 @@ class BaseBroker(ABC):
         self._session = aiohttp.ClientSession()
         self._pdt_strategy = pdt_strategy
         self._tracer = tracer
-        self._positions = None
-        self._cash = None
-        self._equity = None
-        self._day_trade_count = None
+        self._positions: Optional[Dict[str, Position]] = None
+        self._cash: Optional[Money] = None
+        self._equity: Optional[Money] = None
+        self._day_trade_count: Optional[int] = None
         self._updated_dt = TradingDateTime.now()
+        self._last_refresh_monotonic = time.monotonic()
         self._is_stale_flag = True
+        self._refresh_future: Optional[asyncio.Future] = None
+        self._opened_today_cache: Dict[Tuple[str, date], bool] = {}
+        self._account_exposure: Optional[Decimal] = None
 
     @classmethod
     async def create(
@@ -87,7 +119,7 @@ class BaseBroker(ABC):
         """
         self = cls.__new__(cls)
         BaseBroker.__init__(self, pdt_strategy=pdt_strategy, tracer=tracer)
-        with self._tracer.start_as_current_span("BaseBroker.create") as span:
+        with start_span(self._tracer, "BaseBroker.create") as span:
             try:
                 await self._initialize()
                 await self._stale_handler()
@@ -136,6 +168,9 @@ class BaseBroker(ABC):
     async def _place_order(self, order: Order) -> None:
         """
         Implement the low-level order placement logic specific to the subclass (e.g., interaction with the API).
+
+        Implementations that do no I/O may be plain (non-async) methods; place_order only awaits the result
+        when it is awaitable.
         """
         pass
 
@@ -143,62 +178,102 @@ class BaseBroker(ABC):
     async def _cancel_all_orders(self) -> None:
         """
         Implement the low-level order cancellation logic specific to the subclass (e.g., interaction with the API).
+
+        Like _place_order, this may be a plain method when no I/O is needed.
         """
         pass
 
+    async def _refresh_parts(self) -> Optional[Dict[str, Awaitable]]:
+        """
+        Optionally provide the independent fetches that make up a refresh so they can run concurrently.
+
+        Return a dictionary mapping a state name ("positions", "cash", "equity" or "day_trade_count") to an
+        awaitable resolving to the new value for that piece of state. BaseBroker._refresh awaits all of them
+        with asyncio.gather and assigns each result to the matching attribute (e.g. "cash" -> self._cash), so a
+        refresh costs max(RTT) instead of sum(RTT). For Alpaca the independent requests are
+        GET /v2/account (cash, equity and day_trade_count), GET /v2/positions and
+        GET /v2/orders?status=closed&after=today (the orders backing each position).
+
+        The default returns None, in which case the _refresh_* methods are awaited one after another. Use that
+        path when the pieces depend on each other (e.g. equity computed from refreshed cash and positions).
+        """
+        return None
+
     async def _refresh(self):
-        with self._tracer.start_as_current_span("BaseBroker._refresh") as span:
-            await self._refresh_positions()
-            await self._refresh_cash()
-            await self._refresh_equity()
-            await self._refresh_day_trade_count()
+        with start_span(self._tracer, "BaseBroker._refresh") as span:
+            parts = await self._refresh_parts()
+            if parts is None:
+                await self._refresh_positions()
+                await self._refresh_cash()
+                await self._refresh_equity()
+                await self._refresh_day_trade_count()
+            else:
+                span.add_event("refreshing state concurrently: {}".format(", ".join(parts)))
+                results = await asyncio.gather(*parts.values())
+                for name, value in zip(parts, results):
+                    setattr(self, f"_{name}", value)
             span.set_status(trace.StatusCode.OK)
 
     async def get_available_cash(self) -> Money:
-        with self._tracer.start_as_current_span("BaseBroker.get_cash") as span:
+        with start_span(self._tracer, "BaseBroker.get_cash") as span:
             await self._stale_handler()
-            span.set_attribute("cash", str(self._cash))
+            if span.is_recording():
+                span.set_attribute("cash", str(self._cash))
             span.set_status(trace.StatusCode.OK)
             return self._cash
 
     async def get_position(self, symbol: str) -> Optional[Position]:
-        with self._tracer.start_as_current_span("BaseBroker.get_position") as span:
+        with start_span(self._tracer, "BaseBroker.get_position") as span:
             await self._stale_handler()
             position = self._positions.get(symbol, None)
-            span.set_attribute("position", str(position))
+            if span.is_recording():
+                span.set_attribute("position", str(position))
             span.set_status(trace.StatusCode.OK)
             return position
 
-    async def get_positions(self) -> Optional[Dict[str, Position]]:
-        with self._tracer.start_as_current_span("BaseBroker.get_positions") as span:
+    async def get_positions(self) -> Optional[Mapping[str, Position]]:
+        """
+        Return a read-only view of the current positions (symbol → Position).
+
+        The view is not a copy: it is valid until the next refresh, which happens after place_order or once the
+        state goes stale. Callers that need to keep the positions around longer should copy them.
+        """
+        with start_span(self._tracer, "BaseBroker.get_positions") as span:
             await self._stale_handler()
             span.set_attribute("positions_count", len(self._positions))
             span.set_status(trace.StatusCode.OK)
-            return self._positions
+            return types.MappingProxyType(self._positions)
 
     async def get_equity(self) -> Money:
-        with self._tracer.start_as_current_span("BaseBroker.get_equity") as span:
+        with start_span(self._tracer, "BaseBroker.get_equity") as span:
             await self._stale_handler()
-            span.set_attribute("equity", str(self._equity))
+            if span.is_recording():
+                span.set_attribute("equity", str(self._equity))
             span.set_status(trace.StatusCode.OK)
             return self._equity
 
     async def get_account_exposure(self) -> Decimal:
-        with self._tracer.start_as_current_span("BaseBroker.get_account_exposure") as span:
+        with start_span(self._tracer, "BaseBroker.get_account_exposure") as span:
             await self._stale_handler()
             if self._equity.amount == 0:
                 span.set_status(trace.StatusCode.OK)
                 span.set_attribute("account_exposure", "0")
                 return Decimal(0)
-            exposure = (
-                sum([position.get_market_value.amount for position in self._positions.values()]) / self._equity.amount
-            )
-            span.set_attribute("account_exposure", str(exposure))
+            # Account-wide and asked for once per symbol evaluated, so it is worked out once per refresh.
+            exposure = self._account_exposure
+            if exposure is None:
+                # Sum the Decimal amounts directly; building Money per step or a temporary list buys nothing here.
+                market_value = Decimal(0)
+                for position in self._positions.values():
+                    market_value += position.get_market_value.amount
+                exposure = self._account_exposure = market_value / self._equity.amount
+            if span.is_recording():
+                span.set_attribute("account_exposure", str(exposure))
             span.set_status(trace.StatusCode.OK)
             return exposure
 
     async def get_position_exposure(self, symbol: str) -> Decimal:
-        with self._tracer.start_as_current_span("BaseBroker.get_position_exposure") as span:
+        with start_span(self._tracer, "BaseBroker.get_position_exposure") as span:
             await self._stale_handler()
             position = self._positions.get(symbol, None)
             if position is None:
@@ -208,45 +283,92 @@ class BaseBroker(ABC):
                 span.set_status(trace.StatusCode.OK)
                 return Decimal(0)
             exposure = position.size * position.average_cost.amount / self._equity.amount
-            span.set_attribute("exposure", str(exposure))
+            if span.is_recording():
+                span.set_attribute("exposure", str(exposure))
             span.set_status(trace.StatusCode.OK)
             return exposure
 
     async def get_count_of_positions_opened_today(self) -> int:
-        with self._tracer.start_as_current_span("BaseBroker.get_count_of_positions_opened_today") as span:
+        with start_span(self._tracer, "BaseBroker.get_count_of_positions_opened_today") as span:
             await self._stale_handler()
-            start_of_day = TradingDateTime.start_of_current_day()
-            count = 0
-            for _, position in self._positions.items():
-                orders = position.get_orders_created_after_dt(start_of_day)
-                if len(orders) > 0:
-                    count += 1
+            trading_date = TradingDateTime.start_of_current_day().timestamp.date()
+            # Snapshot the symbols so a refresh landing between awaits cannot mutate what we iterate.
+            symbols = tuple(self._positions)
+            opened_today = await asyncio.gather(
+                *(self._cached_position_opened_today(symbol, trading_date) for symbol in symbols)
+            )
+            count = sum(opened_today)
             span.set_status(trace.StatusCode.OK)
-            span.set_attribute("positions_opened_today_count", str(count))
+            if span.is_recording():
+                span.set_attribute("positions_opened_today_count", str(count))
             return count
 
+    async def position_opened_today(self, symbol: str) -> bool:
+        """
+        Whether the position in symbol was opened during the current trading day.
+
+        The answer cannot change within a trading day until the positions themselves change, so it is cached
+        per (symbol, trading date) and the cache is dropped whenever the state is refreshed.
+        """
+        with start_span(self._tracer, "BaseBroker.position_opened_today") as span:
+            await self._stale_handler()
+            trading_date = TradingDateTime.start_of_current_day().timestamp.date()
+            opened_today = await self._cached_position_opened_today(symbol, trading_date)
+            span.set_attribute("position_opened_today", opened_today)
+            span.set_status(trace.StatusCode.OK)
+            return opened_today
+
+    async def _cached_position_opened_today(self, symbol: str, trading_date: date) -> bool:
+        key = (symbol, trading_date)
+        opened_today = self._opened_today_cache.get(key)
+        if opened_today is None:
+            # Entries from a previous trading day can never be hit again, so drop them on a miss.
+            stale_keys = [cached_key for cached_key in self._opened_today_cache if cached_key[1] != trading_date]
+            for stale_key in stale_keys:
+                del self._opened_today_cache[stale_key]
+            opened_today = await self._position_opened_today(symbol)
+            self._opened_today_cache[key] = opened_today
+        return opened_today
+
+    async def _position_opened_today(self, symbol: str) -> bool:
+        """
+        Determine whether the position in symbol was opened today.
+
+        The default inspects the orders attached to the cached position. Subclasses may override this with a
+        call to the broker API; results are memoized by position_opened_today.
+        """
+        position = self._positions.get(symbol, None)
+        if position is None:
+            return False
+        return position.has_orders_created_after_dt(TradingDateTime.start_of_current_day())
+
     async def place_order(self, order: Order) -> None:
         """
         This is the concrete place_order method in BaseBroker.
         It performs a state refresh check, runs PDT logic, delegates to the implementation-specific _execute_order,
         and then marks the state as stale.
         """
-        with self._tracer.start_as_current_span("BaseBroker.place_order") as span:
+        with start_span(self._tracer, "BaseBroker.place_order") as span:
             await self._stale_handler()
 
             await self._validate_pre_order(order)
-            await self._place_order(order)
+            result = self._place_order(order)
+            if inspect.isawaitable(result):
+                await result
             self._is_stale_flag = True
             span.set_status(trace.StatusCode.OK)
-            span.add_event(
-                "Order opened successfully: symbol={}, side={}, quantity={}".format(
-                    order.symbol, order.side, order.quantity_filled
+            if span.is_recording():
+                span.add_event(
+                    "Order opened successfully: symbol={}, side={}, quantity={}".format(
+                        order.symbol, order.side, order.quantity_filled
+                    )
                 )
-            )
 
     async def cancel_all_orders(self) -> None:
-        with self._tracer.start_as_current_span("BaseBroker.cancel_all_orders") as span:
-            await self._cancel_all_orders()
+        with start_span(self._tracer, "BaseBroker.cancel_all_orders") as span:
+            result = self._cancel_all_orders()
+            if inspect.isawaitable(result):
+                await result
             self._is_stale_flag = True
             span.set_status(trace.StatusCode.OK)
 
@@ -271,48 +393,83 @@ class BaseBroker(ABC):
         """
         we dont need to check pdt rules if cash is over 25k. However, if this trade puts us below 25k, we need to check pdt rules.
         """
-        with self._tracer.start_as_current_span("BaseBroker._validate_pre_order") as span:
+        with start_span(self._tracer, "BaseBroker._validate_pre_order") as span:
             if (order.quantity_requested * order.current_price.amount) > self._cash.amount:
                 raise ValueError("Insufficient cash to place order")
             if not (self._cash.amount - order.quantity_requested * order.current_price.amount) < 25000:
                 span.add_event("cash is over 25k, skipping pdt rules")
                 span.set_status(trace.StatusCode.OK)
                 return
-            span.add_event(
-                "checking pdt rules. cash after order: {}".format(
-                    self._cash.amount - order.quantity_requested * order.current_price.amount
+            if span.is_recording():
+                span.add_event(
+                    "checking pdt rules. cash after order: {}".format(
+                        self._cash.amount - order.quantity_requested * order.current_price.amount
+                    )
                 )
-            )
-            count_of_positions_opened_today = await self.get_count_of_positions_opened_today()
-            context = PDTContext(
-                order=order,
-                position=self._positions.get(order.symbol, None),
-                rolling_day_trade_count=self._day_trade_count,
-                count_of_positions_opened_today=count_of_positions_opened_today,
-            )
+            position = self._positions.get(order.symbol, None)
+            if self._is_opening_order(order, position):
+                await self._validate_open(order)
+            else:
+                self._validate_close(order, position)
 
-            # Let the strategy evaluate the context
-            decision = self._pdt_strategy.evaluate_order(context)
+            # Additional common verifications can be incorporated here
 
-            # Process the decision
-            if not decision.allowed:
-                reason = decision.reason or "PDT restrictions prevent this order"
-                raise PDTRuleViolationException(reason)
+    @staticmethod
+    def _is_opening_order(order: Order, position: Optional[Position]) -> bool:
+        """Whether the order opens a new position or adds to an existing one (as opposed to closing it)."""
+        if position is None:
+            return True
+        # Position.side walks every order, so read it once.
+        position_side = position.side
+        return (position_side is PositionSide.LONG and order.side is OrderSide.BUY) or (
+            position_side is PositionSide.SHORT and order.side is OrderSide.SELL
+        )
+
+    async def _validate_open(self, order: Order) -> None:
+        """
+        Check an order that opens or adds to a position against the PDT strategy.
 
-            # Additional common verifications can be incorporated here
+        Only opening orders need the count of positions opened today, so it is fetched here rather than
+        for every order.
+        """
+        count_of_positions_opened_today = await self.get_count_of_positions_opened_today()
+        context = PDTContext(
+            order=order,
+            position=self._positions.get(order.symbol, None),
+            rolling_day_trade_count=self._day_trade_count,
+            count_of_positions_opened_today=count_of_positions_opened_today,
+        )
+        self._enforce_pdt_decision(context)
+
+    def _validate_close(self, order: Order, position: Position) -> None:
+        """Check an order that reduces or closes an existing position against the PDT strategy."""
+        context = PDTContext(
+            order=order,
+            position=position,
+            rolling_day_trade_count=self._day_trade_count,
+        )
+        self._enforce_pdt_decision(context)
+
+    def _enforce_pdt_decision(self, context: PDTContext) -> None:
+        decision = self._pdt_strategy.evaluate_order(context)
+        if not decision.allowed:
+            reason = decision.reason or "PDT restrictions prevent this order"
+            raise PDTRuleViolationException(reason)
 
     def _clear_current_state(self) -> None:
-        with self._tracer.start_as_current_span("BaseBroker._clear_current_state") as span:
+        with start_span(self._tracer, "BaseBroker._clear_current_state") as span:
             span.add_event("clearing current state")
             self._cash = None
             self._positions = None
             self._equity = None
             self._day_trade_count = None
             self._updated_dt = None
+            self._opened_today_cache.clear()
+            self._account_exposure = None
             span.set_status(trace.StatusCode.OK)
 
     def _is_state_in_good_order(self) -> None:
-        with self._tracer.start_as_current_span("BaseBroker._is_state_in_good_order") as span:
+        with start_span(self._tracer, "BaseBroker._is_state_in_good_order") as span:
             span.add_event("checking if state is in good order")
             if self._cash is None:
                 span.record_exception(ValueError("Cash is not initialized"))
@@ -348,23 +505,45 @@ class BaseBroker(ABC):
             span.set_status(trace.StatusCode.OK)
 
     async def _stale_handler(self) -> bool:
-        with self._tracer.start_as_current_span("BaseBroker._stale_handler") as span:
-            # Use existing staleness logic (or refactor as needed)
-            if self._updated_dt.timestamp < TradingDateTime.now().timestamp - timedelta(minutes=10):
-                span.add_event("stale_state_detected due to timestamp difference")
+        with start_span(self._tracer, "BaseBroker._stale_handler") as span:
+            # Staleness is a wall-clock duration, so a monotonic delta is enough here. TradingDateTime is
+            # only stamped (for auditing) once a refresh actually happens.
+            if time.monotonic() - self._last_refresh_monotonic > STALE_AFTER_SECONDS:
+                span.add_event("stale_state_detected due to elapsed time since last refresh")
                 self._is_stale_flag = True
                 span.add_event("_is_stale_flag set to True")
 
-            if self._is_stale_flag:
-                self._clear_current_state()
-                await self._refresh()
-                self._updated_dt = TradingDateTime.now()
-                self._is_state_in_good_order()
+            if self._is_stale_flag or self._refresh_future is not None:
+                # Single-flight: concurrent callers that find the state stale all await the same refresh
+                # instead of each hitting the broker API. No lock is needed as the check-and-set below
+                # happens without yielding to the event loop. A refresh in flight is joined even though it has
+                # already cleared the flag, as the state is cleared until it completes.
+                if self._refresh_future is None:
+                    span.add_event("starting refresh")
+                    self._refresh_future = asyncio.ensure_future(self._do_refresh())
+                else:
+                    span.add_event("joining in-flight refresh")
+                # shield so a cancelled caller doesn't cancel the refresh the other callers are waiting on
+                await asyncio.shield(self._refresh_future)
 
-            self._is_stale_flag = False
-            span.add_event("_is_stale_flag set to False")
             span.set_status(trace.StatusCode.OK)
 
+    async def _do_refresh(self) -> None:
+        # The flag is cleared here, before the broker is read, and never by the callers awaiting the refresh: an
+        # order placed while the refresh runs sets it again and must stay visible to the next _stale_handler call.
+        self._is_stale_flag = False
+        try:
+            self._clear_current_state()
+            await self._refresh()
+            self._updated_dt = TradingDateTime.now()
+            self._last_refresh_monotonic = time.monotonic()
+            self._is_state_in_good_order()
+        except BaseException:
+            self._is_stale_flag = True
+            raise
+        finally:
+            self._refresh_future = None
+
     async def __aenter__(self):
         """Enter the async context manager.
 
@@ -0,0 +1,9 @@
+from decimal import Decimal
+
+from ...shared.models import Money
+
+# Money is immutable, so these are built once and shared by the mock broker and its tests.
+STARTING_CASH = Money(amount=Decimal(100000))
+FILL_PRICE = Money(amount=Decimal(100))
+CASH_BELOW_PDT_MINIMUM = Money(amount=Decimal(24999))
+CASH_ABOVE_PDT_MINIMUM = Money(amount=Decimal(26000))
@@ -1,16 +1,36 @@
+import copy
 from opentelemetry import trace
 from decimal import Decimal
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional, Set
 from datetime import timedelta
 from ..base_broker import BaseBroker
 from ..models import Order, Position, OrderStatus, OrderSide, PositionSide
 from ...shared.models import Money
 from ....test_utils.position_generator import PositionGenerator, PositionCriteria
 from ...shared.models import TradingDateTime
+from ...shared.tracing import start_span
+from ._constants import FILL_PRICE, STARTING_CASH
+
+# Order statuses whose filled quantity moves cash.
+_FILL_STATUSES = frozenset((OrderStatus.FILLED, OrderStatus.PARTIAL_FILL))
 
 
 class MockBroker(BaseBroker):
 
+    # _snapshot_of_positions and _snapshot_of_cash are the mock's account "server side": BaseBroker clears
+    # _positions and _cash before every refresh, and the _refresh_* hooks restore them from the snapshots.
+    # __dict__ is kept so tests can still patch methods on a broker instance.
+    __slots__ = (
+        "_pending_orders",
+        "_snapshot_of_positions",
+        "_snapshot_of_cash",
+        "_time_stamp",
+        "_opened_today",
+        "_opened_today_date",
+        "_initial_positions",
+        "__dict__",
+    )
+
     def __init__(
         self,
         *args,
@@ -19,37 +39,47 @@ class MockBroker(BaseBroker):
         """Disabled constructor - use MockBroker.create() instead."""
         raise TypeError("Use MockBroker.create() instead to create a new broker")
 
-    async def _initialize(self):
-        with self._tracer.start_as_current_span("mock_broker._initialize") as span:
+    async def _initialize(self) -> None:
+        with start_span(self._tracer, "mock_broker._initialize") as span:
             self._pending_orders: List[Order] = []
-            self._cash = Money(amount=Decimal(100000))
+            self._cash = STARTING_CASH
             positions = PositionGenerator(criteria=PositionCriteria(count=3)).generate_positions()
-            position_dict = {position.symbol: position for position in positions}
-            self._positions: Dict[str, Position] = position_dict
-            self._snapshot_of_positions: Dict[str, Position] = position_dict
+            # Pristine copies for reset(); positions in the snapshot are mutated as orders fill.
+            self._initial_positions: List[Position] = [position.model_copy(deep=True) for position in positions]
+            self._snapshot_of_positions: Dict[str, Position] = {position.symbol: position for position in positions}
+            self._positions: Dict[str, Position] = self._snapshot_of_positions
+            # Symbols of held positions that count as opened today, kept in step with fills and overrides so
+            # the opened-today count is a len() instead of a scan over every position. _opened_today_date is the
+            # trading day the set belongs to; it is rebuilt from order history once that day has passed.
+            self._rebuild_opened_today(positions)
             self._snapshot_of_cash = self._cash
             self._time_stamp = TradingDateTime.now()
             span.set_status(trace.StatusCode.OK)
             return
 
-    async def _refresh_positions(self):
-        with self._tracer.start_as_current_span("mock_broker._refresh_positions") as span:
+    async def _refresh_positions(self) -> None:
+        with start_span(self._tracer, "mock_broker._refresh_positions") as span:
             self._positions = self._snapshot_of_positions
+            self._roll_opened_today()
 
-            trading_datetime = TradingDateTime.now()
+            # One clock read per refresh: it stamps the refresh and dates every fill processed in it.
+            self._time_stamp = TradingDateTime.now()
+            trading_datetime = self._time_stamp
             while trading_datetime.is_weekend:
                 trading_datetime = TradingDateTime.from_utc(trading_datetime.timestamp - timedelta(days=1))
+            start_of_day = TradingDateTime.start_of_current_day().timestamp
 
             for order in self._pending_orders:
                 order.status = OrderStatus.FILLED
                 order.quantity_filled = order.quantity_requested
-                order.avg_fill_price = Money(amount=Decimal(100))
+                order.avg_fill_price = FILL_PRICE
                 order.filled_at = trading_datetime
-                for symbol, position in self._positions.items():
-                    if order.symbol == symbol:
-                        position.orders.append(order)
-                        span.add_event(f"Added order to position {symbol}")
-                        break
+                if order.created_at.timestamp >= start_of_day:
+                    self._opened_today.add(order.symbol)
+                position = self._positions.get(order.symbol, None)
+                if position is not None:
+                    position.orders.append(order)
+                    span.add_event(f"Added order to position {order.symbol}")
                 else:
                     position = Position(symbol=order.symbol, orders=[order])
                     self._positions[position.symbol] = position
@@ -59,53 +89,142 @@ class MockBroker(BaseBroker):
             symbols_to_remove = [symbol for symbol, position in self._positions.items() if position.size == Decimal(0)]
             for symbol in symbols_to_remove:
                 self._positions.pop(symbol)
+                self._opened_today.discard(symbol)
                 span.add_event(f"Removed position {symbol} with 0 size")
 
             span.set_status(trace.StatusCode.OK)
 
-    async def _refresh_cash(self):
-        with self._tracer.start_as_current_span("mock_broker._refresh_cash") as span:
-            self._cash = self._snapshot_of_cash
+    async def _refresh_cash(self) -> None:
+        with start_span(self._tracer, "mock_broker._refresh_cash") as span:
+            if not self._pending_orders:
+                # Nothing was placed since the last refresh, so the cash snapshot is still current.
+                self._cash = self._snapshot_of_cash
+                span.set_status(trace.StatusCode.OK)
+                return
+
+            # Accumulate the net cash movement as a Decimal and build Money once, rather than per order.
+            cash_amount = self._snapshot_of_cash.amount
             for order in self._pending_orders:
-                if order.side == OrderSide.BUY:
-                    if order.status in [OrderStatus.FILLED, OrderStatus.PARTIAL_FILL]:
-                        self._cash -= Money(amount=order.quantity_filled * order.avg_fill_price.amount)
+                if order.side is OrderSide.BUY:
+                    if order.status in _FILL_STATUSES:
+                        cash_amount -= order.quantity_filled * order.avg_fill_price.amount
                 else:
-                    if order.status in [OrderStatus.FILLED, OrderStatus.PARTIAL_FILL]:
+                    if order.status in _FILL_STATUSES:
                         # if closing a short position, we need to add the cash back to the account
                         position = self._positions.get(order.symbol, None)
-                        if position is None or position.side == PositionSide.LONG:
-                            self._cash += Money(amount=order.quantity_filled * order.avg_fill_price.amount)
+                        position_side = position.side if position is not None else None
+                        if position is None or position_side is PositionSide.LONG:
+                            cash_amount += order.quantity_filled * order.avg_fill_price.amount
                         else:
-                            if position.side == PositionSide.SHORT:
-                                self._cash -= Money(amount=order.quantity_filled * order.avg_fill_price.amount)
+                            if position_side is PositionSide.SHORT:
+                                cash_amount -= order.quantity_filled * order.avg_fill_price.amount
+            self._cash = Money.model_construct(amount=cash_amount, currency=self._snapshot_of_cash.currency)
 
             # we need the orders/position to be present for cash refresh to work
-            # Therefore we reset the pending orders and snapshot of positions after the cash refresh
-            self._pending_orders = []
-            self._snapshot_of_positions = self._positions
+            # Therefore we reset the pending orders after the cash refresh. Positions were updated in place in
+            # the snapshot by _refresh_positions, so only the cash snapshot needs to move forward.
+            self._pending_orders.clear()
             self._snapshot_of_cash = self._cash
-            self._time_stamp = TradingDateTime.now()
 
             span.set_status(trace.StatusCode.OK)
 
-    async def _refresh_equity(self):
-        with self._tracer.start_as_current_span("mock_broker._refresh_equity") as span:
-            self._equity = Money(
-                amount=self._cash.amount
-                + sum(position.get_market_value.amount for _, position in self._positions.items())
-            )
+    async def _refresh_equity(self) -> None:
+        with start_span(self._tracer, "mock_broker._refresh_equity") as span:
+            total = self._cash.amount
+            for position in self._positions.values():
+                total += position.get_market_value.amount
+            self._equity = Money.model_construct(amount=total, currency=self._cash.currency)
             span.set_status(trace.StatusCode.OK)
 
-    async def _refresh_day_trade_count(self):
+    async def _refresh_day_trade_count(self) -> None:
         self._day_trade_count = 1
 
-    async def _place_order(self, order: Order) -> None:
-        with self._tracer.start_as_current_span("mock_broker._place_order") as span:
-            try:
-                if not hasattr(self, "_pending_orders"):
-                    self._pending_orders = []
+    async def reset(self) -> None:
+        """
+        Restore the account to the state it was created with and refresh.
+
+        Positions, cash, pending orders and opened-today flags go back to their initial values, so one
+        broker can be shared by many tests without them seeing each other's orders.
+        """
+        with start_span(self._tracer, "mock_broker.reset") as span:
+            self._pending_orders.clear()
+            positions = [position.model_copy(deep=True) for position in self._initial_positions]
+            self._snapshot_of_positions = {position.symbol: position for position in positions}
+            self._rebuild_opened_today(positions)
+            self._snapshot_of_cash = STARTING_CASH
+            self._is_stale_flag = True
+            await self._stale_handler()
+            span.set_status(trace.StatusCode.OK)
 
+    async def clone(self) -> "MockBroker":
+        """
+        Return a broker sharing this one's session, PDT strategy and tracer, reset to the initial account.
+
+        Cheaper than create() for handing each test its own broker; the clone must not be closed, as the
+        session belongs to the original.
+        """
+        with start_span(self._tracer, "mock_broker.clone") as span:
+            broker = copy.copy(self)
+            broker._pending_orders = []
+            broker._opened_today_cache = {}
+            broker._refresh_future = None
+            await broker.reset()
+            span.set_status(trace.StatusCode.OK)
+            return broker
+
+    def _rebuild_opened_today(
+        self, positions: Iterable[Position], start_of_day: Optional[TradingDateTime] = None
+    ) -> None:
+        if start_of_day is None:
+            start_of_day = TradingDateTime.start_of_current_day()
+        self._opened_today: Set[str] = {
+            position.symbol for position in positions if position.has_orders_created_after_dt(start_of_day)
+        }
+        self._opened_today_date = start_of_day.trading_date
+
+    def _roll_opened_today(self) -> None:
+        """Rebuild the opened-today set from order history if the trading day has changed since it was built."""
+        start_of_day = TradingDateTime.start_of_current_day()
+        if start_of_day.trading_date != self._opened_today_date:
+            self._rebuild_opened_today(self._snapshot_of_positions.values(), start_of_day)
+
+    async def get_count_of_positions_opened_today(self) -> int:
+        with start_span(self._tracer, "mock_broker.get_count_of_positions_opened_today") as span:
+            await self._stale_handler()
+            self._roll_opened_today()
+            count = len(self._opened_today)
+            span.set_status(trace.StatusCode.OK)
+            return count
+
+    async def _position_opened_today(self, symbol: str) -> bool:
+        self._roll_opened_today()
+        return symbol in self._opened_today
+
+    async def set_position_opened_today(self, symbol: str, opened_today: bool) -> None:
+        """
+        Force whether the position in symbol counts as opened today, overriding its order history.
+
+        Lets tests set up PDT scenarios without patching the broker.
+        """
+        await self.set_positions_opened_today({symbol: opened_today})
+
+    async def set_positions_opened_today(self, flags: Dict[str, bool]) -> None:
+        """Apply several set_position_opened_today overrides (symbol → opened today) in one step."""
+        with start_span(self._tracer, "mock_broker.set_positions_opened_today") as span:
+            self._roll_opened_today()
+            for symbol, opened_today in flags.items():
+                # Only held positions can count as opened today; this keeps the count equal to len().
+                if opened_today and symbol in self._positions:
+                    self._opened_today.add(symbol)
+                else:
+                    self._opened_today.discard(symbol)
+            for key in [key for key in self._opened_today_cache if key[0] in flags]:
+                del self._opened_today_cache[key]
+            span.set_status(trace.StatusCode.OK)
+
+    def _place_order(self, order: Order) -> None:
+        with start_span(self._tracer, "mock_broker._place_order") as span:
+            try:
                 self._pending_orders.append(order)
 
                 span.add_event(f"Added pending order: {order.side.value} {order.quantity_requested} of {order.symbol}")
@@ -116,12 +235,11 @@ class MockBroker(BaseBroker):
             else:
                 span.set_status(trace.StatusCode.OK)
 
-    async def _cancel_all_orders(self) -> None:
-        with self._tracer.start_as_current_span("mock_broker._cancel_all_orders") as span:
+    def _cancel_all_orders(self) -> None:
+        with start_span(self._tracer, "mock_broker._cancel_all_orders") as span:
             try:
-                if hasattr(self, "_pending_orders"):
-                    self._pending_orders = []
-                    span.add_event("Cleared all pending orders")
+                self._pending_orders.clear()
+                span.add_event("Cleared all pending orders")
             except Exception as e:
                 span.record_exception(e)
                 span.set_status(trace.StatusCode.ERROR)
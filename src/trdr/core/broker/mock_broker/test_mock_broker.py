@@ -5,6 +5,7 @@ from datetime import timedelta
 
 from ..models import Order, Position, OrderStatus, OrderSide, OrderType, PositionSide
 from ...shared.models import Money, TradingDateTime
+from ._constants import CASH_ABOVE_PDT_MINIMUM, CASH_BELOW_PDT_MINIMUM, FILL_PRICE
 from ...broker.pdt.exceptions import PDTRuleViolationException
 
 
@@ -47,34 +48,36 @@ def test_initial_state(mock_broker_with_nun_strategy):
     assert broker._snapshot_of_positions == broker._positions
 
 
-def test_get_position(mock_broker_with_nun_strategy):
+async def test_get_position(mock_broker_with_nun_strategy):
     """Test retrieving a position by symbol."""
     broker = mock_broker_with_nun_strategy
 
     # Get a symbol that exists
     symbol = list(broker._positions.keys())[0]
-    position = asyncio.run(broker.get_position(symbol))
+    position = await broker.get_position(symbol)
 
     assert position is not None
     assert position.symbol == symbol
 
     # Get a position that doesn't exist
-    position = asyncio.run(broker.get_position("NONEXISTENT"))
+    position = await broker.get_position("NONEXISTENT")
     assert position is None
 
 
-def test_get_positions(mock_broker_with_nun_strategy):
+async def test_get_positions(mock_broker_with_nun_strategy):
     """Test retrieving all positions."""
     broker = mock_broker_with_nun_strategy
 
-    positions = asyncio.run(broker.get_positions())
+    positions = await broker.get_positions()
 
     assert positions is not None
     assert len(positions) == 3  # Default is 3 positions
     assert positions == broker._positions
+    with pytest.raises(TypeError):
+        positions["NEW"] = None
 
 
-def test_place_order(mock_broker_with_nun_strategy):
+async def test_place_order(mock_broker_with_nun_strategy):
     """Test placing an order."""
     broker = mock_broker_with_nun_strategy
 
@@ -89,25 +92,27 @@ def test_place_order(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
     assert broker._pending_orders == []
     assert broker._is_stale_flag is False
-    asyncio.run(broker.place_order(order))
+    await broker.place_order(order)
     assert broker._pending_orders == [order]
     assert broker._is_stale_flag is True
-    position = asyncio.run(broker.get_position("TEST"))
+    position = await broker.get_position("TEST")
     assert broker._is_stale_flag is False
     assert position is not None
     assert position.symbol == "TEST"
     assert position.size == order.quantity_requested
-    assert position.get_market_value == Money(amount=order.quantity_requested * order.avg_fill_price.amount)
-    assert broker._cash.amount == Decimal("100000") - position.get_market_value.amount
+    # get_market_value is recomputed from the orders on every access, so read it once.
+    market_value = position.get_market_value
+    assert market_value == Money(amount=order.quantity_requested * order.avg_fill_price.amount)
+    assert broker._cash.amount == Decimal("100000") - market_value.amount
 
 
-def test_adding_to_existing_position(mock_broker_with_wiggle_strategy):
+async def test_adding_to_existing_position(mock_broker_with_wiggle_strategy):
     """Test adding an order to an existing position."""
     broker = mock_broker_with_wiggle_strategy
 
@@ -123,12 +128,12 @@ def test_adding_to_existing_position(mock_broker_with_wiggle_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
-    asyncio.run(broker.place_order(order))
-    position = asyncio.run(broker.get_position("TEST"))
+    await broker.place_order(order)
+    position = await broker.get_position("TEST")
     assert broker._is_stale_flag is False
     assert position is not None
     assert position.symbol == "TEST"
@@ -144,12 +149,12 @@ def test_adding_to_existing_position(mock_broker_with_wiggle_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
-    asyncio.run(broker.place_order(next_order))
-    position = asyncio.run(broker.get_position("TEST"))
+    await broker.place_order(next_order)
+    position = await broker.get_position("TEST")
     assert broker._is_stale_flag is False
     assert position is not None
     assert position.symbol == "TEST"
@@ -170,17 +175,17 @@ def test_adding_to_existing_position(mock_broker_with_wiggle_strategy):
         quantity_requested=position.size,
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
-    asyncio.run(broker.place_order(close_order))
-    position = asyncio.run(broker.get_position("TEST"))
+    await broker.place_order(close_order)
+    position = await broker.get_position("TEST")
     assert position is None
     assert broker._cash.amount == Decimal("100000")
 
 
-def test_refresh_equity(mock_broker_with_nun_strategy):
+async def test_refresh_equity(mock_broker_with_nun_strategy):
     """Test that equity calculation is correct."""
     broker = mock_broker_with_nun_strategy
     trading_datetime = TradingDateTime.now()
@@ -188,8 +193,8 @@ def test_refresh_equity(mock_broker_with_nun_strategy):
         trading_datetime = TradingDateTime.from_utc(trading_datetime.timestamp - timedelta(days=1))
 
     # Get initial equity
-    initial_equity = asyncio.run(broker.get_equity())
-    positions = asyncio.run(broker.get_positions())
+    initial_equity = await broker.get_equity()
+    positions = await broker.get_positions()
     current_positions_market_value = sum(position.get_market_value.amount for position in positions.values())
     current_equity = broker._cash + Money(amount=current_positions_market_value)
     assert initial_equity == current_equity
@@ -202,24 +207,24 @@ def test_refresh_equity(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
-    asyncio.run(broker.place_order(order))
+    await broker.place_order(order)
     assert broker._pending_orders == [order]
     assert broker._is_stale_flag is True
 
     # Refresh and verify equity = cash + position market values
-    updated_equity = asyncio.run(broker.get_equity())
+    updated_equity = await broker.get_equity()
     assert broker._is_stale_flag is False
-    positions = asyncio.run(broker.get_positions())
+    positions = await broker.get_positions()
     current_positions_market_value = sum(position.get_market_value.amount for position in positions.values())
     current_equity = broker._cash + Money(amount=current_positions_market_value)
     assert updated_equity == current_equity
 
 
-def test_cancel_all_orders(mock_broker_with_nun_strategy):
+async def test_cancel_all_orders(mock_broker_with_nun_strategy):
     """Test that cancel_all_orders clears pending orders."""
     broker = mock_broker_with_nun_strategy
     trading_datetime = TradingDateTime.now()
@@ -234,7 +239,7 @@ def test_cancel_all_orders(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
@@ -245,23 +250,23 @@ def test_cancel_all_orders(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
 
-    asyncio.run(broker.place_order(order1))
+    await broker.place_order(order1)
     broker._is_stale_flag = False
-    asyncio.run(broker.place_order(order2))
+    await broker.place_order(order2)
     assert len(broker._pending_orders) == 2
 
     # Cancel all orders
-    asyncio.run(broker.cancel_all_orders())
+    await broker.cancel_all_orders()
     assert len(broker._pending_orders) == 0
     assert broker._is_stale_flag is True
 
 
-def test_account_exposure(mock_broker_with_nun_strategy):
+async def test_account_exposure(mock_broker_with_nun_strategy):
     """Test that account exposure is calculated correctly."""
     broker = mock_broker_with_nun_strategy
     trading_datetime = TradingDateTime.now()
@@ -269,8 +274,8 @@ def test_account_exposure(mock_broker_with_nun_strategy):
         trading_datetime = TradingDateTime.from_utc(trading_datetime.timestamp - timedelta(days=1))
 
     # Get initial exposure
-    initial_equity = asyncio.run(broker.get_equity())
-    initial_exposure = asyncio.run(broker.get_account_exposure())
+    initial_equity = await broker.get_equity()
+    initial_exposure = await broker.get_account_exposure()
 
     # Place a buy order
     order = Order(
@@ -280,29 +285,29 @@ def test_account_exposure(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
-    asyncio.run(broker.place_order(order))
+    await broker.place_order(order)
 
     # Check exposure increased
-    new_exposure = asyncio.run(broker.get_account_exposure())
+    new_exposure = await broker.get_account_exposure()
     assert new_exposure > initial_exposure
 
     # Verify exposure calculation
-    positions = asyncio.run(broker.get_positions())
+    positions = await broker.get_positions()
     total_position_value = sum(abs(p.get_market_value.amount) for p in positions.values())
-    current_equity = asyncio.run(broker.get_equity())
+    current_equity = await broker.get_equity()
     expected_exposure = total_position_value / current_equity.amount
     assert abs(new_exposure - expected_exposure) < Decimal("0.0001")  # Allow for small floating point differences
 
 
-def test_pdt_cash_validation(mock_broker_with_nun_strategy):
+async def test_pdt_cash_validation(mock_broker_with_nun_strategy):
     """Test that cash validation is correct for PDT rules."""
     broker = mock_broker_with_nun_strategy
-    broker._snapshot_of_cash = Money(amount=Decimal(24999))
-    broker._cash = Money(amount=Decimal(24999))
+    broker._snapshot_of_cash = CASH_BELOW_PDT_MINIMUM
+    broker._cash = CASH_BELOW_PDT_MINIMUM
     broker._day_trade_count = 3
     order = Order(
         symbol="TEST",
@@ -311,26 +316,26 @@ def test_pdt_cash_validation(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(10),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=TradingDateTime.now(),
         filled_at=None,
     )
     with pytest.raises(PDTRuleViolationException):
-        asyncio.run(broker.place_order(order))
-    broker._snapshot_of_cash = Money(amount=Decimal(26000))
-    broker._cash = Money(amount=Decimal(26000))
-    asyncio.run(broker.place_order(order))
+        await broker.place_order(order)
+    broker._snapshot_of_cash = CASH_ABOVE_PDT_MINIMUM
+    broker._cash = CASH_ABOVE_PDT_MINIMUM
+    await broker.place_order(order)
     assert broker._is_stale_flag is True
     assert broker._pending_orders == [order]
-    cash = asyncio.run(broker.get_available_cash())
+    cash = await broker.get_available_cash()
     assert cash.amount == Decimal("25000")
 
 
-def test_pdt_cash_validation_for_shorts(mock_broker_with_nun_strategy):
+async def test_pdt_cash_validation_for_shorts(mock_broker_with_nun_strategy):
     """Test that cash validation works correctly when shorting with PDT rules."""
     broker = mock_broker_with_nun_strategy
-    broker._snapshot_of_cash = Money(amount=Decimal(24999))
-    broker._cash = Money(amount=Decimal(24999))
+    broker._snapshot_of_cash = CASH_BELOW_PDT_MINIMUM
+    broker._cash = CASH_BELOW_PDT_MINIMUM
     broker._day_trade_count = 3
 
     # Try to open a short position with insufficient cash
@@ -341,32 +346,32 @@ def test_pdt_cash_validation_for_shorts(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(10),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=TradingDateTime.now(),
         filled_at=None,
     )
 
     with pytest.raises(PDTRuleViolationException):
-        asyncio.run(broker.place_order(short_order))
+        await broker.place_order(short_order)
 
     # Now with sufficient cash
-    broker._snapshot_of_cash = Money(amount=Decimal(26000))
-    broker._cash = Money(amount=Decimal(26000))
+    broker._snapshot_of_cash = CASH_ABOVE_PDT_MINIMUM
+    broker._cash = CASH_ABOVE_PDT_MINIMUM
 
-    asyncio.run(broker.place_order(short_order))
+    await broker.place_order(short_order)
     assert broker._is_stale_flag is True
     assert broker._pending_orders == [short_order]
 
     # Verify position and cash
-    position = asyncio.run(broker.get_position("TEST"))
+    position = await broker.get_position("TEST")
     assert position.side == PositionSide.SHORT
     assert position.size == Decimal(10)
 
-    cash = asyncio.run(broker.get_available_cash())
+    cash = await broker.get_available_cash()
     assert cash.amount == Decimal("25000")
 
 
-def test_position_exposure(mock_broker_with_nun_strategy):
+async def test_position_exposure(mock_broker_with_nun_strategy):
     """Test that position exposure is calculated correctly."""
     broker = mock_broker_with_nun_strategy
     trading_datetime = TradingDateTime.now()
@@ -381,14 +386,222 @@ def test_position_exposure(mock_broker_with_nun_strategy):
         quantity_requested=Decimal(100),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=trading_datetime,
         filled_at=None,
     )
-    asyncio.run(broker.place_order(order))
+    await broker.place_order(order)
 
-    position_exposure = asyncio.run(broker.get_position_exposure("TEST"))
+    position_exposure = await broker.get_position_exposure("TEST")
 
     assert position_exposure > 0
     assert position_exposure < 1  # Exposure should be less than 100%
     assert isinstance(position_exposure, Decimal)
+
+
+async def test_state_becomes_stale_after_timeout(mock_broker_with_nun_strategy):
+    """Test that state older than the staleness window is refreshed on next access."""
+    from ..base_broker import STALE_AFTER_SECONDS
+
+    broker = mock_broker_with_nun_strategy
+    previous_updated_dt = broker._updated_dt
+    broker._last_refresh_monotonic -= STALE_AFTER_SECONDS + 1
+
+    await broker.get_available_cash()
+    assert broker._is_stale_flag is False
+    assert broker._updated_dt.timestamp > previous_updated_dt.timestamp
+
+
+async def test_refresh_uses_refresh_parts_when_provided(mock_broker_with_nun_strategy, monkeypatch):
+    """Test that state returned by _refresh_parts is gathered and assigned by _refresh."""
+    broker = mock_broker_with_nun_strategy
+
+    async def fetch(value):
+        return value
+
+    async def refresh_parts():
+        return {
+            "positions": fetch({}),
+            "cash": fetch(Money.of(10)),
+            "equity": fetch(Money.of(20)),
+            "day_trade_count": fetch(2),
+        }
+
+    monkeypatch.setattr(broker, "_refresh_parts", refresh_parts)
+    broker._is_stale_flag = True
+    await broker.get_available_cash()
+
+    assert broker._positions == {}
+    assert broker._cash == Money.of(10)
+    assert broker._equity == Money.of(20)
+    assert broker._day_trade_count == 2
+
+
+async def test_concurrent_stale_reads_share_a_single_refresh(mock_broker_with_nun_strategy, monkeypatch):
+    """Test that concurrent callers hitting stale state trigger only one refresh."""
+    broker = mock_broker_with_nun_strategy
+    refresh = broker._refresh
+    refresh_count = 0
+
+    async def counting_refresh():
+        nonlocal refresh_count
+        refresh_count += 1
+        await asyncio.sleep(0)
+        await refresh()
+
+    monkeypatch.setattr(broker, "_refresh", counting_refresh)
+    broker._is_stale_flag = True
+
+    async def read_concurrently():
+        return await asyncio.gather(*(broker.get_available_cash() for _ in range(5)))
+
+    results = await read_concurrently()
+    assert refresh_count == 1
+    assert all(cash == broker._cash for cash in results)
+    assert broker._refresh_future is None
+
+
+async def test_mock_broker_spans_are_recorded_with_a_real_tracer():
+    """Test that the NoOpTracer fast path does not swallow spans from a configured tracer."""
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from ..pdt.nun_strategy import NunStrategy
+    from .mock_broker import MockBroker
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = provider.get_tracer(__name__)
+
+    async def create_and_close():
+        broker = await MockBroker.create(pdt_strategy=NunStrategy.create(), tracer=tracer)
+        await broker._session.close()
+
+    await create_and_close()
+    span_names = {span.name for span in exporter.get_finished_spans()}
+    assert "mock_broker._initialize" in span_names
+    assert "mock_broker._refresh_positions" in span_names
+
+
+async def test_refresh_without_pending_orders_keeps_cash(mock_broker_with_nun_strategy):
+    """Test that a refresh with no order activity reuses the cash snapshot."""
+    broker = mock_broker_with_nun_strategy
+    cash_before = broker._cash
+
+    broker._is_stale_flag = True
+    assert await broker.get_available_cash() is cash_before
+
+
+async def test_clone_does_not_share_mutable_state(mock_broker_template_with_nun_strategy):
+    """Test that a clone starts from the initial account and leaves the template untouched."""
+    template = mock_broker_template_with_nun_strategy
+    clone = await template.clone()
+
+    assert clone._session is template._session
+    assert clone._positions.keys() == template._positions.keys()
+    assert clone._pending_orders is not template._pending_orders
+    assert clone._opened_today is not template._opened_today
+    assert clone._opened_today_cache is not template._opened_today_cache
+    for symbol, position in clone._positions.items():
+        assert position is not template._positions[symbol]
+
+    clone.__dict__["patched"] = True
+    assert "patched" not in template.__dict__
+
+
+async def test_concurrent_orders_are_all_applied(mock_broker_with_nun_strategy):
+    """Test that orders placed concurrently each end up in the positions and the cash."""
+    broker = mock_broker_with_nun_strategy
+    cash_before = broker._cash
+
+    trading_datetime = TradingDateTime.now()
+    while trading_datetime.is_weekend:
+        trading_datetime = TradingDateTime.from_utc(trading_datetime.timestamp - timedelta(days=1))
+    orders = [
+        Order(
+            symbol=symbol,
+            side=OrderSide.BUY,
+            type=OrderType.MARKET,
+            quantity_requested=Decimal(10),
+            quantity_filled=Decimal(0),
+            status=OrderStatus.PENDING,
+            current_price=FILL_PRICE,
+            created_at=trading_datetime,
+        )
+        for symbol in ("TEST1", "TEST2", "TEST3")
+    ]
+
+    await asyncio.gather(*(broker.place_order(order) for order in orders))
+
+    positions = await broker.get_positions()
+    assert {"TEST1", "TEST2", "TEST3"} <= positions.keys()
+    assert broker._cash.amount == cash_before.amount - 3 * Decimal(10) * FILL_PRICE.amount
+
+
+async def test_order_placed_alongside_a_getter_during_a_refresh_is_not_lost(mock_broker_with_nun_strategy):
+    """Test that a getter sharing an in-flight refresh with place_order does not mark the new order as seen."""
+    broker = mock_broker_with_nun_strategy
+    trading_datetime = TradingDateTime.now()
+    while trading_datetime.is_weekend:
+        trading_datetime = TradingDateTime.from_utc(trading_datetime.timestamp - timedelta(days=1))
+    order = Order(
+        symbol="TEST",
+        side=OrderSide.BUY,
+        type=OrderType.MARKET,
+        quantity_requested=Decimal(10),
+        quantity_filled=Decimal(0),
+        status=OrderStatus.PENDING,
+        current_price=FILL_PRICE,
+        created_at=trading_datetime,
+    )
+
+    broker._is_stale_flag = True
+    await asyncio.gather(broker.place_order(order), broker.get_available_cash())
+
+    assert broker._is_stale_flag is True
+    positions = await broker.get_positions()
+    assert "TEST" in positions
+    assert broker._pending_orders == []
+
+
+async def test_reader_joining_a_refresh_in_flight_waits_for_its_state(mock_broker_with_nun_strategy, monkeypatch):
+    """Test that a reader arriving after a refresh has cleared the stale flag still waits for the refresh."""
+    broker = mock_broker_with_nun_strategy
+    refresh_positions = type(broker)._refresh_positions
+
+    async def slow_refresh_positions(self):
+        await asyncio.sleep(0.01)
+        await refresh_positions(self)
+
+    monkeypatch.setattr(type(broker), "_refresh_positions", slow_refresh_positions)
+    broker._is_stale_flag = True
+    first_reader = asyncio.ensure_future(broker.get_available_cash())
+    await asyncio.sleep(0.001)
+
+    assert broker._is_stale_flag is False
+    assert await broker.get_available_cash() is not None
+    assert len(await broker.get_positions()) == len(broker._snapshot_of_positions)
+    assert await first_reader == await broker.get_available_cash()
+
+
+async def test_broker_as_context_manager():
+    """Test that leaving the async context closes the broker's session."""
+    from ..pdt.nun_strategy import NunStrategy
+    from .mock_broker import MockBroker
+
+    async with await MockBroker.create(pdt_strategy=NunStrategy.create()) as broker:
+        session = broker._session
+        assert await broker.get_available_cash() == Money.of(100000)
+    assert session.closed
+    assert broker._session is None
+
+
+async def test_account_exposure_is_reused_until_the_next_refresh(mock_broker_with_nun_strategy):
+    broker = mock_broker_with_nun_strategy
+    exposure = await broker.get_account_exposure()
+    assert await broker.get_account_exposure() is exposure
+
+    broker._is_stale_flag = True
+    assert await broker.get_account_exposure() is not exposure
+    assert await broker.get_account_exposure() == exposure
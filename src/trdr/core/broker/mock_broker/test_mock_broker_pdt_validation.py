@@ -1,44 +1,133 @@
-import pytest
 import asyncio
+import re
+import pytest
 from decimal import Decimal
 from datetime import timedelta
 
 from ..models import OrderSide, Order, OrderType, OrderStatus, PositionSide
-from ...shared.models import Money, TradingDateTime
+from ...shared.models import TradingDateTime
+from ._constants import CASH_BELOW_PDT_MINIMUM, FILL_PRICE
 from ..pdt.exceptions import PDTRuleViolationException, PDTStrategyException
 
+# Compiled once and escaped, so the parametrized cases below match the literal messages.
+PDT_OPEN_RE = re.compile(re.escape("PDT restrictions prevent opening a new position"))
+PDT_WIGGLE_ROOM_RE = re.compile(re.escape("PDT restrictions prevent opening a new position: exceeds wiggle room"))
+
+# (rolling day trade count, whether the order is allowed) for the nun/wiggle day-trade limit of 3.
+DAY_TRADE_LIMIT_CASES = [(0, True), (1, True), (2, True), (3, False)]
+
+
+def reset_broker_state(broker, day_trade_count=0, opened_today=()):
+    """
+    Reset the PDT-relevant state of the broker; only symbols in opened_today count as opened today.
+
+    Writes the broker's state directly; set_position(s)_opened_today is covered by its own test below.
+    """
+    broker._day_trade_count = day_trade_count
+    broker._opened_today = set(opened_today).intersection(broker._positions)
+    broker._opened_today_cache.clear()
+
 
-def test_position_opened_today_tracking(mock_broker_with_nun_strategy):
+async def test_position_opened_today_tracking(mock_broker_with_nun_strategy):
     broker = mock_broker_with_nun_strategy
 
     count = 0
     current_day = TradingDateTime.start_of_current_day()
-    for _, position in broker._positions.items():
+    for symbol, position in broker._positions.items():
         orders = position.get_orders_created_after_dt(current_day)
+        assert await broker.position_opened_today(symbol) is (len(orders) > 0)
         if len(orders) > 0:
             count += 1
 
-    assert asyncio.run(broker.get_count_of_positions_opened_today()) == count
+    assert await broker.get_count_of_positions_opened_today() == count
 
 
-def test_position_opened_today_tracking_with_triggers_refresh(mock_broker_with_nun_strategy):
+async def test_position_opened_today_tracking_with_triggers_refresh(mock_broker_with_nun_strategy):
     """Test the position_opened_today tracking mechanism with triggers refresh."""
     broker = mock_broker_with_nun_strategy
     broker._is_stale_flag = True
-    asyncio.run(broker.get_count_of_positions_opened_today())
+    await broker.get_count_of_positions_opened_today()
 
     assert broker._is_stale_flag is False
 
 
-def test_nun_strategy_buy_orders_day_trade_limits(mock_broker_with_nun_strategy, monkeypatch):
-    """Test NunStrategy enforcement of day trade limits for BUY orders."""
+async def test_position_opened_today_is_cached_until_refresh(mock_broker_with_nun_strategy, monkeypatch):
+    """Test that position_opened_today results are memoized and dropped on refresh."""
     broker = mock_broker_with_nun_strategy
-    broker._cash = Money(amount=Decimal(24999))
+    symbol = list(broker._positions.keys())[0]
+    position_opened_today = broker._position_opened_today
+    call_count = 0
+
+    async def counting_position_opened_today(symbol):
+        nonlocal call_count
+        call_count += 1
+        return await position_opened_today(symbol)
+
+    monkeypatch.setattr(broker, "_position_opened_today", counting_position_opened_today)
+
+    first = await broker.position_opened_today(symbol)
+    assert await broker.position_opened_today(symbol) == first
+    assert call_count == 1
+
+    broker._is_stale_flag = True
+    await broker.position_opened_today(symbol)
+    assert call_count == 2
+
+
+async def test_set_position_opened_today_overrides_order_history(mock_broker_with_nun_strategy):
+    """Test that opened-today overrides replace the order-derived answer and any cached result."""
+    broker = mock_broker_with_nun_strategy
+    symbols = list(broker._positions)
+    await broker.get_count_of_positions_opened_today()
+
+    await broker.set_positions_opened_today({symbol: False for symbol in symbols})
+    assert await broker.get_count_of_positions_opened_today() == 0
+
+    await broker.set_position_opened_today(symbols[0], True)
+    assert await broker.position_opened_today(symbols[0]) is True
+    assert await broker.get_count_of_positions_opened_today() == 1
+
+    # A symbol without a position never counts as opened today.
+    await broker.set_position_opened_today("NOT_HELD", True)
+    assert await broker.get_count_of_positions_opened_today() == 1
+
+
+async def test_opened_today_rolls_over_to_the_next_trading_day(mock_broker_with_nun_strategy, monkeypatch):
+    """Test that positions opened on a previous day stop counting once the trading day changes."""
+    broker = mock_broker_with_nun_strategy
+    order = Order(
+        symbol="NEW",
+        side=OrderSide.BUY,
+        type=OrderType.MARKET,
+        quantity_requested=Decimal(10),
+        quantity_filled=Decimal(0),
+        status=OrderStatus.PENDING,
+        current_price=FILL_PRICE,
+        created_at=TradingDateTime.now(),
+    )
+    await broker.place_order(order)
+    assert await broker.position_opened_today("NEW") is True
+    count_before = await broker.get_count_of_positions_opened_today()
+    assert count_before >= 1
+
+    later_day = TradingDateTime.from_utc(TradingDateTime.start_of_current_day().timestamp + timedelta(days=3))
+    monkeypatch.setattr(TradingDateTime, "start_of_current_day", classmethod(lambda cls: later_day))
+    positions = await broker.get_positions()
+    expected = sum(1 for position in positions.values() if position.has_orders_created_after_dt(later_day))
+
+    assert await broker.get_count_of_positions_opened_today() == expected
+    assert await broker.position_opened_today("NEW") is False
+    broker._is_stale_flag = True
+    assert await broker.get_count_of_positions_opened_today() == expected
 
-    async def mock_count():
-        return 0
 
-    monkeypatch.setattr(broker, "get_count_of_positions_opened_today", mock_count)
+@pytest.mark.parametrize("day_trade_count, allowed", DAY_TRADE_LIMIT_CASES)
+async def test_nun_strategy_buy_orders_day_trade_limits(mock_broker_with_nun_strategy, day_trade_count, allowed):
+    """Test NunStrategy enforcement of day trade limits for BUY orders."""
+    broker = mock_broker_with_nun_strategy
+    broker._cash = CASH_BELOW_PDT_MINIMUM
+
+    reset_broker_state(broker, day_trade_count=day_trade_count)
 
     created_at = TradingDateTime.start_of_current_day()
     while created_at.is_weekend:
@@ -48,36 +137,32 @@ def test_nun_strategy_buy_orders_day_trade_limits(mock_broker_with_nun_strategy,
     existing_position = broker._positions.get(symbol)
     order_side = OrderSide.BUY if existing_position.side == PositionSide.LONG else OrderSide.SELL
 
-    for day_trade_count in range(4):
-        broker._day_trade_count = day_trade_count
-
-        if day_trade_count < 3:
-            order = Order(
-                symbol=symbol,
-                side=order_side,
-                type=OrderType.MARKET,
-                quantity_requested=Decimal(1000),
-                quantity_filled=Decimal(0),
-                status=OrderStatus.PENDING,
-                current_price=Money(amount=Decimal(100)),
-                created_at=created_at,
-            )
-            asyncio.run(broker._validate_pre_order(order))
-        else:
-            # Should not be able to buy
-            with pytest.raises(PDTRuleViolationException, match="PDT restrictions prevent opening a new position"):
-                asyncio.run(broker._validate_pre_order(order))
-
-
-def test_nun_strategy_sell_orders_day_trade_limits(mock_broker_with_nun_strategy, monkeypatch):
+    order = Order(
+        symbol=symbol,
+        side=order_side,
+        type=OrderType.MARKET,
+        quantity_requested=Decimal(10),
+        quantity_filled=Decimal(0),
+        status=OrderStatus.PENDING,
+        current_price=FILL_PRICE,
+        created_at=created_at,
+    )
+
+    if allowed:
+        await broker._validate_pre_order(order)
+    else:
+        # Should not be able to buy
+        with pytest.raises(PDTRuleViolationException, match=PDT_OPEN_RE):
+            await broker._validate_pre_order(order)
+
+
+@pytest.mark.parametrize("day_trade_count, allowed", DAY_TRADE_LIMIT_CASES)
+async def test_nun_strategy_sell_orders_day_trade_limits(mock_broker_with_nun_strategy, day_trade_count, allowed):
     """Test NunStrategy enforcement of day trade limits for SELL orders."""
     broker = mock_broker_with_nun_strategy
-    broker._cash = Money(amount=Decimal(24999))
+    broker._cash = CASH_BELOW_PDT_MINIMUM
 
-    async def mock_count():
-        return 0
-
-    monkeypatch.setattr(broker, "get_count_of_positions_opened_today", mock_count)
+    reset_broker_state(broker, day_trade_count=day_trade_count)
 
     created_at = TradingDateTime.start_of_current_day()
     while created_at.is_weekend:
@@ -86,41 +171,33 @@ def test_nun_strategy_sell_orders_day_trade_limits(mock_broker_with_nun_strategy
     symbol = list(broker._positions.keys())[0]
     existing_position = broker._positions.get(symbol)
     order_side = OrderSide.SELL if existing_position.side == PositionSide.LONG else OrderSide.BUY
-    # Test sell orders with different day trade counts
-    for day_trade_count in range(4):
-        broker._day_trade_count = day_trade_count
-        broker._cash = Money(amount=Decimal(24999))
-
-        # order to close existing position
-        sell_order = Order(
-            symbol=symbol,
-            side=order_side,
-            type=OrderType.MARKET,
-            quantity_requested=Decimal(1000),
-            quantity_filled=Decimal(0),
-            status=OrderStatus.PENDING,
-            current_price=Money(amount=Decimal(100)),
-            created_at=created_at,
-        )
+    # order to close existing position
+    sell_order = Order(
+        symbol=symbol,
+        side=order_side,
+        type=OrderType.MARKET,
+        quantity_requested=Decimal(10),
+        quantity_filled=Decimal(0),
+        status=OrderStatus.PENDING,
+        current_price=FILL_PRICE,
+        created_at=created_at,
+    )
 
-        if day_trade_count < 3:
-            # Should be able to sell with less than 3 day trades
-            asyncio.run(broker._validate_pre_order(sell_order))
-        else:
-            # Should not be able to sell with 3 day trades
-            with pytest.raises(PDTStrategyException):
-                asyncio.run(broker._validate_pre_order(sell_order))
+    if allowed:
+        # Should be able to sell with less than 3 day trades
+        await broker._validate_pre_order(sell_order)
+    else:
+        # Should not be able to sell with 3 day trades
+        with pytest.raises(PDTStrategyException):
+            await broker._validate_pre_order(sell_order)
 
 
-def test_wiggle_strategy_buy_orders_day_trade_limits(mock_broker_with_wiggle_strategy, monkeypatch):
+@pytest.mark.parametrize("day_trade_count, allowed", DAY_TRADE_LIMIT_CASES)
+async def test_wiggle_strategy_buy_orders_day_trade_limits(mock_broker_with_wiggle_strategy, day_trade_count, allowed):
     broker = mock_broker_with_wiggle_strategy
-    broker._cash = Money(amount=Decimal(24999))
+    broker._cash = CASH_BELOW_PDT_MINIMUM
 
-    async def mock_count():
-
-        return 2
-
-    monkeypatch.setattr(broker, "get_count_of_positions_opened_today", mock_count)
+    reset_broker_state(broker, day_trade_count=day_trade_count, opened_today=list(broker._positions)[:2])
 
     created_at = TradingDateTime.start_of_current_day()
     while created_at.is_weekend:
@@ -134,37 +211,26 @@ def test_wiggle_strategy_buy_orders_day_trade_limits(mock_broker_with_wiggle_str
         symbol=symbol,
         side=order_side,
         type=OrderType.MARKET,
-        quantity_requested=Decimal(1000),
+        quantity_requested=Decimal(10),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=created_at,
     )
 
-    broker._day_trade_count = 0
-    asyncio.run(broker._validate_pre_order(order))
-
-    broker._day_trade_count = 1
-    asyncio.run(broker._validate_pre_order(order))
+    if allowed:
+        await broker._validate_pre_order(order)
+    else:
+        with pytest.raises(PDTRuleViolationException, match=PDT_WIGGLE_ROOM_RE):
+            await broker._validate_pre_order(order)
 
-    broker._day_trade_count = 2
-    asyncio.run(broker._validate_pre_order(order))
 
-    with pytest.raises(
-        PDTRuleViolationException, match="PDT restrictions prevent opening a new position: exceeds wiggle room"
-    ):
-        broker._day_trade_count = 3
-        asyncio.run(broker._validate_pre_order(order))
-
-
-def test_wiggle_strategy_sell_orders_day_trade_limits(mock_broker_with_wiggle_strategy, monkeypatch):
+@pytest.mark.parametrize("day_trade_count, allowed", DAY_TRADE_LIMIT_CASES)
+async def test_wiggle_strategy_sell_orders_day_trade_limits(mock_broker_with_wiggle_strategy, day_trade_count, allowed):
     broker = mock_broker_with_wiggle_strategy
-    broker._cash = Money(amount=Decimal(24999))
+    broker._cash = CASH_BELOW_PDT_MINIMUM
 
-    async def mock_count():
-        return 0
-
-    monkeypatch.setattr(broker, "get_count_of_positions_opened_today", mock_count)
+    reset_broker_state(broker, day_trade_count=day_trade_count)
 
     created_at = TradingDateTime.start_of_current_day()
     while created_at.is_weekend:
@@ -174,38 +240,33 @@ def test_wiggle_strategy_sell_orders_day_trade_limits(mock_broker_with_wiggle_st
     existing_position = broker._positions.get(symbol)
     order_side = OrderSide.SELL if existing_position.side == PositionSide.LONG else OrderSide.BUY
 
-    for day_trade_count in range(4):
-        broker._day_trade_count = day_trade_count
-
-        # order to close existing position
-        sell_order = Order(
-            symbol=symbol,
-            side=order_side,
-            type=OrderType.MARKET,
-            quantity_requested=Decimal(1000),
-            quantity_filled=Decimal(0),
-            status=OrderStatus.PENDING,
-            current_price=Money(amount=Decimal(100)),
-            created_at=created_at,
-        )
+    # order to close existing position
+    sell_order = Order(
+        symbol=symbol,
+        side=order_side,
+        type=OrderType.MARKET,
+        quantity_requested=Decimal(10),
+        quantity_filled=Decimal(0),
+        status=OrderStatus.PENDING,
+        current_price=FILL_PRICE,
+        created_at=created_at,
+    )
 
-        if day_trade_count < 3:
-            # Should be able to sell with less than 3 day trades
-            asyncio.run(broker._validate_pre_order(sell_order))
-        else:
-            # Should not be able to sell with 3 day trades
-            with pytest.raises(PDTStrategyException):
-                asyncio.run(broker._validate_pre_order(sell_order))
+    if allowed:
+        # Should be able to sell with less than 3 day trades
+        await broker._validate_pre_order(sell_order)
+    else:
+        # Should not be able to sell with 3 day trades
+        with pytest.raises(PDTStrategyException):
+            await broker._validate_pre_order(sell_order)
 
 
-def test_yolo_strategy_buy_orders_day_trade_limits(mock_broker_with_yolo_strategy, monkeypatch):
+@pytest.mark.parametrize("day_trade_count", [0, 1, 4])
+async def test_yolo_strategy_buy_orders_day_trade_limits(mock_broker_with_yolo_strategy, day_trade_count):
     broker = mock_broker_with_yolo_strategy
-    broker._cash = Money(amount=Decimal(24999))
+    broker._cash = CASH_BELOW_PDT_MINIMUM
 
-    async def mock_count():
-        return 0
-
-    monkeypatch.setattr(broker, "get_count_of_positions_opened_today", mock_count)
+    reset_broker_state(broker, day_trade_count=day_trade_count)
 
     created_at = TradingDateTime.start_of_current_day()
     while created_at.is_weekend:
@@ -219,59 +280,78 @@ def test_yolo_strategy_buy_orders_day_trade_limits(mock_broker_with_yolo_strateg
         symbol=symbol,
         side=order_side,
         type=OrderType.MARKET,
-        quantity_requested=Decimal(1000),
+        quantity_requested=Decimal(10),
         quantity_filled=Decimal(0),
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal(100)),
+        current_price=FILL_PRICE,
         created_at=created_at,
     )
 
-    broker._day_trade_count = 0
-    asyncio.run(broker._validate_pre_order(order))
-
-    broker._day_trade_count = 1
-    asyncio.run(broker._validate_pre_order(order))
-
-    broker._day_trade_count = 4
-    asyncio.run(broker._validate_pre_order(order))
+    # YOLO never limits opening orders, whatever the day trade count.
+    await broker._validate_pre_order(order)
 
 
-def test_yolo_strategy_sell_orders_day_trade_limits(mock_broker_with_yolo_strategy, monkeypatch):
+async def test_yolo_strategy_validates_orders_for_different_symbols_concurrently(mock_broker_with_yolo_strategy):
+    """Test that validations of independent orders can run concurrently against the same broker state."""
     broker = mock_broker_with_yolo_strategy
-    broker._cash = Money(amount=Decimal(24999))
+    broker._cash = CASH_BELOW_PDT_MINIMUM
 
-    async def mock_count():
-        return 0
-
-    monkeypatch.setattr(broker, "get_count_of_positions_opened_today", mock_count)
+    reset_broker_state(broker, day_trade_count=4)
 
     created_at = TradingDateTime.start_of_current_day()
     while created_at.is_weekend:
         created_at = TradingDateTime.from_utc(created_at.timestamp - timedelta(days=1))
 
-    symbol = list(broker._positions.keys())[0]
-    existing_position = broker._positions.get(symbol)
-    order_side = OrderSide.SELL if existing_position.side == PositionSide.LONG else OrderSide.BUY
-
-    for day_trade_count in range(4):
-        broker._day_trade_count = day_trade_count
-
-        # order to close existing position
-        sell_order = Order(
+    orders = [
+        Order(
             symbol=symbol,
-            side=order_side,
+            side=OrderSide.BUY if position.side == PositionSide.LONG else OrderSide.SELL,
             type=OrderType.MARKET,
-            quantity_requested=Decimal(1000),
+            quantity_requested=Decimal(10),
             quantity_filled=Decimal(0),
             status=OrderStatus.PENDING,
-            current_price=Money(amount=Decimal(100)),
+            current_price=FILL_PRICE,
             created_at=created_at,
         )
+        for symbol, position in broker._positions.items()
+    ]
+
+    async with asyncio.TaskGroup() as task_group:
+        for order in orders:
+            task_group.create_task(broker._validate_pre_order(order))
+
+
+@pytest.mark.parametrize("day_trade_count, allowed", DAY_TRADE_LIMIT_CASES)
+async def test_yolo_strategy_sell_orders_day_trade_limits(mock_broker_with_yolo_strategy, day_trade_count, allowed):
+    broker = mock_broker_with_yolo_strategy
+    broker._cash = CASH_BELOW_PDT_MINIMUM
+
+    reset_broker_state(broker, day_trade_count=day_trade_count)
+
+    created_at = TradingDateTime.start_of_current_day()
+    while created_at.is_weekend:
+        created_at = TradingDateTime.from_utc(created_at.timestamp - timedelta(days=1))
+
+    symbol = list(broker._positions.keys())[0]
+    existing_position = broker._positions.get(symbol)
+    order_side = OrderSide.SELL if existing_position.side == PositionSide.LONG else OrderSide.BUY
+
+    # order to close existing position
+    sell_order = Order(
+        symbol=symbol,
+        side=order_side,
+        type=OrderType.MARKET,
+        quantity_requested=Decimal(10),
+        quantity_filled=Decimal(0),
+        status=OrderStatus.PENDING,
+        current_price=FILL_PRICE,
+        created_at=created_at,
+    )
 
-        if day_trade_count < 3:
-            # Should be able to sell with less than 3 day trades
-            asyncio.run(broker._validate_pre_order(sell_order))
-        else:
-            # Should not be able to sell with 3 day trades
-            with pytest.raises(PDTStrategyException):
-                asyncio.run(broker._validate_pre_order(sell_order))
+    if allowed:
+        # Should be able to sell with less than 3 day trades
+        await broker._validate_pre_order(sell_order)
+    else:
+        # Should not be able to sell with 3 day trades
+        with pytest.raises(PDTStrategyException):
+            await broker._validate_pre_order(sell_order)
@@ -1,7 +1,8 @@
+import sys
 from enum import Enum
 from decimal import Decimal
-from typing import List
-from pydantic import BaseModel, ConfigDict, model_validator
+from typing import Callable, Dict, List, Tuple
+from pydantic import BaseModel, field_validator, model_validator
 
 from ..shared.models import Money, TradingDateTime
 
@@ -44,50 +45,66 @@ class Order(BaseModel):
 
     @property
     def net_quantity_filled(self) -> Decimal:
-        return self.quantity_filled if self.side == OrderSide.BUY else -self.quantity_filled
+        return self.quantity_filled if self.side is OrderSide.BUY else -self.quantity_filled
 
-    model_config = {"arbitrary_types_allowed": True}
+    @field_validator("symbol")
+    @classmethod
+    def intern_symbol(cls, symbol: str) -> str:
+        return sys.intern(symbol)
 
     @model_validator(mode="after")
     def validate_order_state(self) -> "Order":
         """Validate that the order state is consistent."""
-        status = self.status
-
         if self.filled_at is not None and self.filled_at.is_weekend:
             raise ValueError("Orders can't be filled on a weekend")
 
-        # Validation rules by status
-        if status == OrderStatus.PENDING:
-            if self.avg_fill_price is not None:
-                raise ValueError("Pending orders cannot have a fill price")
-            if self.quantity_filled != Decimal(0):
-                raise ValueError("Pending orders must have quantity_filled = 0")
-            if self.filled_at is not None:
-                raise ValueError("Pending orders cannot have a filled_at time")
-            if self.current_price is None:
-                raise ValueError("Pending orders must have a current_price")
-
-        elif status == OrderStatus.FILLED:
-            if self.avg_fill_price is None:
-                raise ValueError("Filled orders must have a fill price")
-            if self.quantity_filled != self.quantity_requested:
-                raise ValueError("Filled orders must have quantity_filled = quantity_requested")
-            if self.filled_at is None:
-                raise ValueError("Filled orders must have a filled_at timestamp")
-
-        elif status == OrderStatus.PARTIAL_FILL:
-            if self.avg_fill_price is None:
-                raise ValueError("Partially filled orders must have a fill price")
-            if self.quantity_filled >= self.quantity_requested:
-                raise ValueError("Partially filled orders must have quantity_filled < quantity_requested")
-            if self.quantity_filled <= Decimal(0):
-                raise ValueError("Partially filled orders must have quantity_filled > 0")
-            if self.filled_at is None:
-                raise ValueError("Partially filled orders must have a filled_at timestamp")
+        validate_status = _STATUS_VALIDATORS.get(self.status)
+        if validate_status is not None:
+            validate_status(self)
 
         return self
 
 
+def _validate_pending(order: Order) -> None:
+    if order.avg_fill_price is not None:
+        raise ValueError("Pending orders cannot have a fill price")
+    if order.quantity_filled != Decimal(0):
+        raise ValueError("Pending orders must have quantity_filled = 0")
+    if order.filled_at is not None:
+        raise ValueError("Pending orders cannot have a filled_at time")
+    if order.current_price is None:
+        raise ValueError("Pending orders must have a current_price")
+
+
+def _validate_filled(order: Order) -> None:
+    if order.avg_fill_price is None:
+        raise ValueError("Filled orders must have a fill price")
+    if order.quantity_filled != order.quantity_requested:
+        raise ValueError("Filled orders must have quantity_filled = quantity_requested")
+    if order.filled_at is None:
+        raise ValueError("Filled orders must have a filled_at timestamp")
+
+
+def _validate_partial_fill(order: Order) -> None:
+    if order.avg_fill_price is None:
+        raise ValueError("Partially filled orders must have a fill price")
+    quantity_filled = order.quantity_filled
+    if quantity_filled >= order.quantity_requested:
+        raise ValueError("Partially filled orders must have quantity_filled < quantity_requested")
+    if quantity_filled <= Decimal(0):
+        raise ValueError("Partially filled orders must have quantity_filled > 0")
+    if order.filled_at is None:
+        raise ValueError("Partially filled orders must have a filled_at timestamp")
+
+
+# Validation rules by status, looked up once per order. Canceled and rejected orders have no extra rules.
+_STATUS_VALIDATORS: Dict[OrderStatus, Callable[[Order], None]] = {
+    OrderStatus.PENDING: _validate_pending,
+    OrderStatus.FILLED: _validate_filled,
+    OrderStatus.PARTIAL_FILL: _validate_partial_fill,
+}
+
+
 class PositionSide(Enum):
     LONG = "LONG"
     SHORT = "SHORT"
@@ -98,48 +115,79 @@ class Position(BaseModel):
     symbol: str
     orders: List[Order]
 
+    @field_validator("symbol")
+    @classmethod
+    def intern_symbol(cls, symbol: str) -> str:
+        # Symbols key the broker's position dict; a lookup with the symbol of another Order or Position is then an
+        # identity match.
+        return sys.intern(symbol)
+
     def get_orders_created_after_dt(self, dt: TradingDateTime) -> List[Order]:
-        if len(self.orders) == 0:
-            return []
-        return [order for order in self.orders if order.created_at.timestamp >= dt.timestamp]
+        # Orders are not kept sorted by created_at (brokers append and extend them as they arrive), so this is
+        # a linear filter; the cutoff is read once rather than per order.
+        timestamp = dt.timestamp
+        return [order for order in self.orders if order.created_at.timestamp >= timestamp]
+
+    def has_orders_created_after_dt(self, dt: TradingDateTime) -> bool:
+        # Streams the orders and stops at the first match instead of materializing the filtered list.
+        timestamp = dt.timestamp
+        return any(order.created_at.timestamp >= timestamp for order in self.orders)
+
+    def _aggregate(self) -> Tuple[Decimal, Decimal, Decimal]:
+        """
+        Walk the orders once and return (net quantity filled, market value, net cost).
+
+        side, size, get_market_value and average_cost all derive from these sums. Not cached: orders are mutable
+        and appended to in place, and positions must reflect that immediately.
+        """
+        net_quantity = Decimal(0)
+        market_value = Decimal(0)
+        net_cost = Decimal(0)
+        for order in self.orders:
+            quantity_filled = order.quantity_filled
+            if not quantity_filled:
+                continue
+            net_quantity_filled = quantity_filled if order.side is OrderSide.BUY else -quantity_filled
+            net_quantity += net_quantity_filled
+            if order.avg_fill_price:
+                price = order.avg_fill_price.amount
+                market_value += abs(quantity_filled) * price
+                net_cost += net_quantity_filled * price
+        return net_quantity, market_value, net_cost
+
+    @staticmethod
+    def _average_cost(net_quantity: Decimal, net_cost: Decimal) -> Money:
+        # The aggregates are Decimals summed from validated Money, so the result skips pydantic validation.
+        if net_quantity == 0:
+            return Money.of(0)
+        return Money.model_construct(amount=net_cost / abs(net_quantity))
 
     @property
     def side(self) -> PositionSide:
         if len(self.orders) == 0:
             return None
-        net_quantity = sum(order.net_quantity_filled for order in self.orders)
+        net_quantity, _, _ = self._aggregate()
         return PositionSide.LONG if net_quantity > 0 else PositionSide.SHORT
 
     @property
     def get_market_value(self) -> Money:
-        if len(self.orders) == 0:
-            return Money(amount=Decimal(0))
-        total_market_value = Decimal(0)
-        for order in self.orders:
-            if order.net_quantity_filled and order.avg_fill_price:
-                total_market_value += abs(order.net_quantity_filled) * order.avg_fill_price.amount
-        return Money(amount=total_market_value)
+        _, market_value, _ = self._aggregate()
+        return Money.model_construct(amount=market_value)
 
     @property
     def size(self) -> Decimal:
-        if len(self.orders) == 0:
-            return Decimal(0)
-        return abs(sum(order.net_quantity_filled for order in self.orders))
+        net_quantity, _, _ = self._aggregate()
+        return abs(net_quantity)
 
     @property
     def average_cost(self) -> Money:
-        if len(self.orders) == 0:
-            return Money(amount=Decimal(0))
-        if self.size == Decimal(0):
-            return Money(amount=Decimal(0))
-        return Money(
-            amount=sum(order.net_quantity_filled * order.avg_fill_price.amount for order in self.orders) / self.size
-        )
+        net_quantity, _, net_cost = self._aggregate()
+        return self._average_cost(net_quantity, net_cost)
 
     def to_json(self) -> str:
         return self.model_dump_json()
 
     def __str__(self) -> str:
-        return f"Position(symbol={self.symbol}, size={self.size}, average_cost={self.average_cost})"
-
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+        net_quantity, _, net_cost = self._aggregate()
+        average_cost = self._average_cost(net_quantity, net_cost)
+        return f"Position(symbol={self.symbol}, size={abs(net_quantity)}, average_cost={average_cost})"
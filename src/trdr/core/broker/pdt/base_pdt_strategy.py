@@ -3,6 +3,7 @@ from opentelemetry import trace
 from abc import ABC, abstractmethod
 
 from .models import PDTContext, PDTDecision
+from ..models import OrderSide, PositionSide
 
 
 T = TypeVar("T", bound="BasePDTStrategy")
@@ -18,6 +19,23 @@ class BasePDTStrategy(ABC):
         BasePDTStrategy.__init__(self, tracer=tracer)
         return self
 
+    @staticmethod
+    def _opens_position(context: PDTContext) -> bool:
+        """
+        Whether the order opens a new position or adds to the existing one, as opposed to reducing it.
+
+        Shared by every strategy, as this is the first question each of them asks.
+        """
+        position = context.position
+        if position is None:
+            return True
+        # Position.side walks every order, so read it once.
+        position_side = position.side
+        order_side = context.order.side
+        return (position_side is PositionSide.LONG and order_side is OrderSide.BUY) or (
+            position_side is PositionSide.SHORT and order_side is OrderSide.SELL
+        )
+
     @abstractmethod
     def evaluate_order(self, context: PDTContext) -> PDTDecision:
         """
@@ -1,9 +1,4 @@
-class BrokerException(Exception):
-    pass
-
-
-class BrokerInitializationException(BrokerException):
-    pass
+from ..exceptions import BrokerException
 
 
 class PDTStrategyException(BrokerException):
@@ -1,17 +1,21 @@
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, ConfigDict
-
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional, Mapping, Any
 
 from ..models import Position, Order
 
 
-class PDTContext(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PDTContext:
     """
     Contains all the information needed by PDT strategies to make decisions.
 
     This context object encapsulates broker state and order information,
     allowing PDT strategies to make informed decisions about whether to
     allow trading actions.
+
+    A plain dataclass rather than a pydantic model: it is built by the broker from already validated
+    Order/Position objects on every order, so re-validating it would only add cost.
     """
 
     # Order information
@@ -22,19 +26,18 @@ class PDTContext(BaseModel):
     count_of_positions_opened_today: int = 0
     rolling_day_trade_count: int = 0
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
-
 
-class PDTDecision(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PDTDecision:
     """
     The decision made by a PDT strategy about a proposed trading action.
 
     This includes whether the action is allowed, the reason for the decision,
     and any suggested modifications to the order parameters.
+
+    Frozen, with a read-only default for modified_params, because strategies return shared prebuilt decisions.
     """
 
     allowed: bool = False
     reason: Optional[str] = None
-    modified_params: Dict[str, Any] = {}
-
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    modified_params: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
@@ -1,8 +1,17 @@
 from .base_pdt_strategy import BasePDTStrategy
 from .models import PDTContext, PDTDecision
-from ..models import OrderSide, PositionSide
 from .exceptions import PDTStrategyException
 
+# The decision depends only on whether the order opens (or adds to) a position and whether day trades remain,
+# so every outcome is built once here rather than per call.
+_ALLOWED = PDTDecision(allowed=True, reason="Order allowed: sufficient day trades available")
+_OPEN_DENIED = PDTDecision(
+    allowed=False,
+    reason="PDT restrictions prevent opening a new position: insufficient day trades available",
+)
+# Indexed by whether opening would exhaust the day trades reserved for closing.
+_OPEN_DECISIONS = (_ALLOWED, _OPEN_DENIED)
+
 
 class NunStrategy(BasePDTStrategy):
     """Pattern Day Trading (PDT) strategy that implements a conservative approach to position management.
@@ -56,31 +65,13 @@ class NunStrategy(BasePDTStrategy):
         number_of_positions_opened_today = context.count_of_positions_opened_today
         rolling_day_trade_count = context.rolling_day_trade_count
 
-        # If we have no open position for order.symbol, we need to check if we can open a new position
-        if context.position is None:
-            if number_of_positions_opened_today + rolling_day_trade_count >= 3:
-                return PDTDecision(
-                    allowed=False,
-                    reason="PDT restrictions prevent opening a new position: insufficient day trades available",
-                )
-            return PDTDecision(allowed=True, reason="Order allowed: sufficient day trades available")
-        else:
-            # if we are adding to a current position, we need to check if we can open a new position
-            if (context.position.side == PositionSide.LONG and context.order.side == OrderSide.BUY) or (
-                context.position.side == PositionSide.SHORT and context.order.side == OrderSide.SELL
-            ):
-                if number_of_positions_opened_today + rolling_day_trade_count >= 3:
-                    return PDTDecision(
-                        allowed=False,
-                        reason="PDT restrictions prevent opening a new position: insufficient day trades available",
-                    )
-                return PDTDecision(allowed=True, reason="Order allowed: sufficient day trades available")
-            elif (rolling_day_trade_count >= 3) and (
-                (context.position.side == PositionSide.LONG and context.order.side == OrderSide.SELL)
-                or (context.position.side == PositionSide.SHORT and context.order.side == OrderSide.BUY)
-            ):
-                raise PDTStrategyException(
-                    f"We are trying to close a position with a current day trade count of 3. We should never reach this point as we should not have been able to open a new position in the first place. The NunStrategy should have prevented this from happening."
-                )
-            else:
-                return PDTDecision(allowed=True, reason="Order allowed: sufficient day trades available")
+        # A new position, or adding to an existing one, needs a day trade reserved for closing it later.
+        if self._opens_position(context):
+            return _OPEN_DECISIONS[number_of_positions_opened_today + rolling_day_trade_count >= 3]
+
+        # A position without orders has no side, so the order neither opens nor closes it.
+        if rolling_day_trade_count >= 3 and context.position.orders:
+            raise PDTStrategyException(
+                f"We are trying to close a position with a current day trade count of 3. We should never reach this point as we should not have been able to open a new position in the first place. The NunStrategy should have prevented this from happening."
+            )
+        return _ALLOWED
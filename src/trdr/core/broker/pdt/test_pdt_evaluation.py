@@ -1,5 +1,5 @@
+import dataclasses
 import pytest
-from decimal import Decimal
 
 from ..models import OrderSide
 from ...shared.models import Money
@@ -28,11 +28,21 @@ def test_pdt_context_creation(create_order, long_dummy_position):
 
 def test_pdt_decision_creation():
     """Test creating a PDTDecision with different values."""
-    decision = PDTDecision(allowed=True, reason="Test reason", modified_params={"amount": Money(amount=Decimal(500))})
+    decision = PDTDecision(allowed=True, reason="Test reason", modified_params={"amount": Money.of(500)})
 
     assert decision.allowed is True
     assert decision.reason == "Test reason"
-    assert decision.modified_params == {"amount": Money(amount=Decimal(500))}
+    assert decision.modified_params == {"amount": Money.of(500)}
+
+
+def test_pdt_decision_is_immutable():
+    """Test that decisions cannot be changed, as strategies share prebuilt instances."""
+    decision = PDTDecision(allowed=True, reason="Test reason")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        decision.allowed = False
+    with pytest.raises(TypeError):
+        decision.modified_params["amount"] = Money.of(500)
 
 
 # Test NunStrategy with the new evaluate_order method
@@ -57,6 +67,19 @@ def test_nun_strategy_evaluate_new_position(create_order):
     assert decision.allowed is False
 
 
+def test_nun_strategy_reuses_decisions(create_order):
+    """Test that NunStrategy hands back the same prebuilt decision for the same outcome."""
+    strategy = NunStrategy.create()
+    order = create_order("AAPL", side=OrderSide.BUY)
+
+    allowed = PDTContext(position=None, order=order, count_of_positions_opened_today=0, rolling_day_trade_count=0)
+    denied = PDTContext(position=None, order=order, count_of_positions_opened_today=3, rolling_day_trade_count=0)
+
+    assert strategy.evaluate_order(allowed) is strategy.evaluate_order(allowed)
+    assert strategy.evaluate_order(denied) is strategy.evaluate_order(denied)
+    assert strategy.evaluate_order(denied).allowed is False
+
+
 def test_nun_strategy_evaluate_existing_position(create_order, long_dummy_position, short_dummy_position):
     """Test NunStrategy evaluating orders for existing positions."""
     strategy = NunStrategy.create()
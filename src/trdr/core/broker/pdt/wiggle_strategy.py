@@ -1,6 +1,26 @@
+import functools
+
 from .base_pdt_strategy import BasePDTStrategy
 from .models import PDTContext, PDTDecision
-from ..models import OrderSide, PositionSide
+
+_CLOSE_ALLOWED = PDTDecision(allowed=True, reason="Order allowed: within wiggle room (max=3)")
+_CLOSE_DENIED = PDTDecision(
+    allowed=False,
+    reason="PDT restrictions prevent closing a position: exceeds wiggle room (max=3)",
+)
+# Indexed by whether a day trade is still available to close with.
+_CLOSE_DECISIONS = (_CLOSE_DENIED, _CLOSE_ALLOWED)
+
+
+@functools.lru_cache(maxsize=64)
+def _open_decision(max_positions: int, allowed: bool) -> PDTDecision:
+    """Build the opening decision for a position limit once; max_positions takes only a handful of values."""
+    if allowed:
+        return PDTDecision(allowed=True, reason=f"Order allowed: within wiggle room (max={max_positions})")
+    return PDTDecision(
+        allowed=False,
+        reason=f"PDT restrictions prevent opening a new position: exceeds wiggle room (max={max_positions})",
+    )
 
 
 class WiggleStrategy(BasePDTStrategy):
@@ -40,26 +60,10 @@ class WiggleStrategy(BasePDTStrategy):
         number_of_positions_opened_today = context.count_of_positions_opened_today
         rolling_day_trade_count = context.rolling_day_trade_count
 
-        if (
-            (context.position is None)
-            or (context.position.side == PositionSide.LONG and context.order.side == OrderSide.BUY)
-            or (context.position.side == PositionSide.SHORT and context.order.side == OrderSide.SELL)
-        ):
+        if self._opens_position(context):
             # opening a new position
             max_positions = (3 - rolling_day_trade_count) + self.wiggle_room
-            if number_of_positions_opened_today < max_positions:
-                return PDTDecision(allowed=True, reason=f"Order allowed: within wiggle room (max={max_positions})")
-            else:
-                return PDTDecision(
-                    allowed=False,
-                    reason=f"PDT restrictions prevent opening a new position: exceeds wiggle room (max={max_positions})",
-                )
-        else:
-            # check if we can close a position
-            if rolling_day_trade_count < 3:
-                return PDTDecision(allowed=True, reason="Order allowed: within wiggle room (max=3)")
-            else:
-                return PDTDecision(
-                    allowed=False,
-                    reason="PDT restrictions prevent closing a position: exceeds wiggle room (max=3)",
-                )
+            return _open_decision(max_positions, number_of_positions_opened_today < max_positions)
+
+        # closing a position is allowed while a day trade remains
+        return _CLOSE_DECISIONS[rolling_day_trade_count < 3]
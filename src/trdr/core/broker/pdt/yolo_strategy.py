@@ -1,6 +1,9 @@
 from .base_pdt_strategy import BasePDTStrategy
 from .models import PDTContext, PDTDecision
-from ..models import OrderSide, PositionSide
+
+_OPEN_ALLOWED = PDTDecision(allowed=True, reason="Order allowed: YOLO strategy permits unlimited buys")
+_CLOSE_ALLOWED = PDTDecision(allowed=True, reason="Order allowed: YOLO strategy permits unlimited sells")
+_CLOSE_DENIED = PDTDecision(allowed=False, reason="Order not allowed: Closing this position would violate PDT rules")
 
 
 class YoloStrategy(BasePDTStrategy):
@@ -33,16 +36,8 @@ class YoloStrategy(BasePDTStrategy):
             PDTDecision with the evaluation result
         """
         rolling_day_trade_count = context.rolling_day_trade_count
-        if (
-            context.position is None
-            or (context.position.side == PositionSide.LONG and context.order.side == OrderSide.BUY)
-            or (context.position.side == PositionSide.SHORT and context.order.side == OrderSide.SELL)
-        ):
-            return PDTDecision(allowed=True, reason="Order allowed: YOLO strategy permits unlimited buys")
-        else:
-            if rolling_day_trade_count < 3:
-                return PDTDecision(allowed=True, reason="Order allowed: YOLO strategy permits unlimited sells")
-            else:
-                return PDTDecision(
-                    allowed=False, reason="Order not allowed: Closing this position would violate PDT rules"
-                )
+        if self._opens_position(context):
+            return _OPEN_ALLOWED
+        if rolling_day_trade_count < 3:
+            return _CLOSE_ALLOWED
+        return _CLOSE_DENIED
@@ -16,7 +16,7 @@ def test_creating_order_with_quantity(weekday_trading_datetime):
         side=OrderSide.BUY,
         type=OrderType.MARKET,
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal("100")),
+        current_price=Money.of(100),
         avg_fill_price=None,
         created_at=weekday_trading_datetime,
         filled_at=None,
@@ -38,7 +38,7 @@ def test_filled_order_validation(weekday_trading_datetime):
         side=OrderSide.BUY,
         type=OrderType.MARKET,
         status=OrderStatus.FILLED,
-        avg_fill_price=Money(amount=Decimal("150.00")),
+        avg_fill_price=Money.of("150.00"),
         created_at=weekday_trading_datetime,
         filled_at=filled_at,
     )
@@ -55,7 +55,7 @@ def test_filled_order_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.FILLED,
-            avg_fill_price=Money(amount=Decimal("150.00")),
+            avg_fill_price=Money.of("150.00"),
             created_at=weekday_trading_datetime,
             filled_at=filled_at,
         )
@@ -83,7 +83,7 @@ def test_filled_order_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.FILLED,
-            avg_fill_price=Money(amount=Decimal("150.00")),
+            avg_fill_price=Money.of("150.00"),
             created_at=weekday_trading_datetime,
             filled_at=None,  # Missing filled_at time
         )
@@ -100,7 +100,7 @@ def test_orders_cannot_be_filled_on_weekends(weekday_trading_datetime, weekend_t
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.FILLED,
-            avg_fill_price=Money(amount=Decimal("150.00")),
+            avg_fill_price=Money.of("150.00"),
             created_at=weekend_trading_datetime,
             filled_at=weekend_trading_datetime,
         )
@@ -118,7 +118,7 @@ def test_partial_fill_validation(weekday_trading_datetime):
         side=OrderSide.BUY,
         type=OrderType.MARKET,
         status=OrderStatus.PARTIAL_FILL,
-        avg_fill_price=Money(amount=Decimal("150.00")),
+        avg_fill_price=Money.of("150.00"),
         created_at=weekday_trading_datetime,
         filled_at=filled_at,
     )
@@ -135,7 +135,7 @@ def test_partial_fill_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.PARTIAL_FILL,
-            avg_fill_price=Money(amount=Decimal("150.00")),
+            avg_fill_price=Money.of("150.00"),
             created_at=weekday_trading_datetime,
             filled_at=filled_at,
         )
@@ -149,7 +149,7 @@ def test_partial_fill_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.PARTIAL_FILL,
-            avg_fill_price=Money(amount=Decimal("150.00")),
+            avg_fill_price=Money.of("150.00"),
             created_at=weekday_trading_datetime,
             filled_at=filled_at,
         )
@@ -177,7 +177,7 @@ def test_partial_fill_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.PARTIAL_FILL,
-            avg_fill_price=Money(amount=Decimal("150.00")),
+            avg_fill_price=Money.of("150.00"),
             created_at=weekday_trading_datetime,
             filled_at=None,  # Missing filled_at time
         )
@@ -195,7 +195,7 @@ def test_pending_order_validation(weekday_trading_datetime):
         side=OrderSide.BUY,
         type=OrderType.MARKET,
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal("100")),
+        current_price=Money.of(100),
         avg_fill_price=None,
         created_at=weekday_trading_datetime,
         filled_at=None,
@@ -213,7 +213,7 @@ def test_pending_order_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.PENDING,
-            current_price=Money(amount=Decimal("100")),
+            current_price=Money.of(100),
             avg_fill_price=None,
             created_at=weekday_trading_datetime,
             filled_at=None,
@@ -228,8 +228,8 @@ def test_pending_order_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.PENDING,
-            current_price=Money(amount=Decimal("100")),
-            avg_fill_price=Money(amount=Decimal("150.00")),  # Should be None for pending
+            current_price=Money.of(100),
+            avg_fill_price=Money.of("150.00"),  # Should be None for pending
             created_at=weekday_trading_datetime,
             filled_at=None,
         )
@@ -243,7 +243,7 @@ def test_pending_order_validation(weekday_trading_datetime):
             side=OrderSide.BUY,
             type=OrderType.MARKET,
             status=OrderStatus.PENDING,
-            current_price=Money(amount=Decimal("100")),
+            current_price=Money.of(100),
             avg_fill_price=None,
             created_at=weekday_trading_datetime,
             filled_at=filled_at,  # Should be None for pending
@@ -294,7 +294,7 @@ def test_cancelled_and_rejected_orders(weekday_trading_datetime):
         side=OrderSide.BUY,
         type=OrderType.MARKET,
         status=OrderStatus.CANCELED,
-        avg_fill_price=Money(amount=Decimal("150.00")),
+        avg_fill_price=Money.of("150.00"),
         created_at=weekday_trading_datetime,
         filled_at=filled_at,
     )
@@ -315,7 +315,7 @@ def test_string_representation(weekday_trading_datetime):
         side=OrderSide.BUY,
         type=OrderType.MARKET,
         status=OrderStatus.FILLED,
-        avg_fill_price=Money(amount=Decimal("150.00")),
+        avg_fill_price=Money.of("150.00"),
         created_at=weekday_trading_datetime,
         filled_at=filled_at,
     )
@@ -390,7 +390,7 @@ def test_order_generation_with_custom_criteria():
         symbol="MSFT",
         side=OrderSide.BUY,
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal("100")),
+        current_price=Money.of(100),
         quantity_min=Decimal("90"),
         quantity_max=Decimal("100"),
     )
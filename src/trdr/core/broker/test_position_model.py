@@ -7,6 +7,12 @@ from typing import List
 from ..shared.models import Money, TradingDateTime
 from .models import Position, Order, OrderSide, OrderType, OrderStatus, PositionSide
 
+# Money is immutable, so the prices shared by many orders below are built once.
+ZERO = Money.of(0)
+PRICE_90 = Money.of(90)
+PRICE_100 = Money.of(100)
+PRICE_120 = Money.of(120)
+
 
 def test_position_initialization(create_order):
     """Test creating a position with a list of orders works correctly"""
@@ -41,7 +47,7 @@ def test_get_orders_created_after_dt():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -52,7 +58,7 @@ def test_get_orders_created_after_dt():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -63,7 +69,7 @@ def test_get_orders_created_after_dt():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -82,6 +88,9 @@ def test_get_orders_created_after_dt():
     assert filtered_orders[0].created_at.timestamp >= cutoff_dt.timestamp
     assert filtered_orders[1].created_at.timestamp >= cutoff_dt.timestamp
 
+    assert position.has_orders_created_after_dt(cutoff_dt)
+    assert not position.has_orders_created_after_dt(TradingDateTime.from_utc(now + datetime.timedelta(hours=1)))
+
 
 def test_size_all_buy_orders():
     """Test size property calculates correctly for all buy orders"""
@@ -94,7 +103,7 @@ def test_size_all_buy_orders():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -105,7 +114,7 @@ def test_size_all_buy_orders():
         symbol="AAPL",
         quantity_requested=Decimal("5"),
         quantity_filled=Decimal("5"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -130,7 +139,7 @@ def test_size_all_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.SELL,
         status=OrderStatus.FILLED,
@@ -141,7 +150,7 @@ def test_size_all_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("5"),
         quantity_filled=Decimal("5"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.SELL,
         status=OrderStatus.FILLED,
@@ -166,7 +175,7 @@ def test_size_mixed_buy_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -177,7 +186,7 @@ def test_size_mixed_buy_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("3"),
         quantity_filled=Decimal("3"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.SELL,
         status=OrderStatus.FILLED,
@@ -188,7 +197,7 @@ def test_size_mixed_buy_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("2"),
         quantity_filled=Decimal("2"),
-        avg_fill_price=Money(amount=Decimal("90")),
+        avg_fill_price=PRICE_90,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -200,7 +209,7 @@ def test_size_mixed_buy_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("2"),
         quantity_filled=Decimal("1"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.PARTIAL_FILL,
@@ -224,7 +233,7 @@ def test_get_market_value():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -235,7 +244,7 @@ def test_get_market_value():
         symbol="AAPL",
         quantity_requested=Decimal("5"),
         quantity_filled=Decimal("5"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -261,7 +270,7 @@ def test_average_cost_single_buy_order():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -271,7 +280,7 @@ def test_average_cost_single_buy_order():
 
     position = Position(symbol="AAPL", orders=[order])
 
-    assert position.average_cost == Money(amount=Decimal("100"))
+    assert position.average_cost == PRICE_100
 
 
 def test_average_cost_multiple_buy_orders():
@@ -285,7 +294,7 @@ def test_average_cost_multiple_buy_orders():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -296,7 +305,7 @@ def test_average_cost_multiple_buy_orders():
         symbol="AAPL",
         quantity_requested=Decimal("5"),
         quantity_filled=Decimal("5"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -322,7 +331,7 @@ def test_average_cost_mixed_buy_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -333,7 +342,7 @@ def test_average_cost_mixed_buy_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("3"),
         quantity_filled=Decimal("3"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.SELL,
         status=OrderStatus.FILLED,
@@ -344,7 +353,7 @@ def test_average_cost_mixed_buy_sell_orders():
         symbol="AAPL",
         quantity_requested=Decimal("2"),
         quantity_filled=Decimal("2"),
-        avg_fill_price=Money(amount=Decimal("90")),
+        avg_fill_price=PRICE_90,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -372,7 +381,7 @@ def test_to_json():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -401,7 +410,7 @@ def test_str_representation():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -420,7 +429,7 @@ def test_position_with_zero_orders():
     position = Position(symbol="AAPL", orders=[])
 
     assert position.size == Decimal("0")
-    assert position.get_market_value == Money(amount=Decimal("0"))
+    assert position.get_market_value == ZERO
 
 
 def test_position_with_only_pending_orders():
@@ -435,7 +444,7 @@ def test_position_with_only_pending_orders():
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal("100")),
+        current_price=PRICE_100,
         created_at=TradingDateTime.from_utc(now),
         filled_at=None,
     )
@@ -447,7 +456,7 @@ def test_position_with_only_pending_orders():
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.PENDING,
-        current_price=Money(amount=Decimal("100")),
+        current_price=PRICE_100,
         created_at=TradingDateTime.from_utc(now),
         filled_at=None,
     )
@@ -455,7 +464,7 @@ def test_position_with_only_pending_orders():
     position = Position(symbol="AAPL", orders=[order1, order2])
 
     assert position.size == Decimal("0")
-    assert position.get_market_value == Money(amount=Decimal("0"))
+    assert position.get_market_value == ZERO
 
 
 def test_position_with_rejected_cancelled_orders():
@@ -469,7 +478,7 @@ def test_position_with_rejected_cancelled_orders():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -516,7 +525,7 @@ def test_position_with_mixed_filled_and_partial_fill_orders():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -527,7 +536,7 @@ def test_position_with_mixed_filled_and_partial_fill_orders():
         symbol="AAPL",
         quantity_requested=Decimal("5"),
         quantity_filled=Decimal("3"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.PARTIAL_FILL,
@@ -552,7 +561,7 @@ def test_market_value_with_negative_position_size():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.SELL,
         status=OrderStatus.FILLED,
@@ -579,7 +588,7 @@ def test_changes_to_orders_reflected_in_position():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -608,7 +617,7 @@ def test_adding_orders_to_position():
         symbol="AAPL",
         quantity_requested=Decimal("10"),
         quantity_filled=Decimal("10"),
-        avg_fill_price=Money(amount=Decimal("100")),
+        avg_fill_price=PRICE_100,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -624,7 +633,7 @@ def test_adding_orders_to_position():
         symbol="AAPL",
         quantity_requested=Decimal("5"),
         quantity_filled=Decimal("5"),
-        avg_fill_price=Money(amount=Decimal("120")),
+        avg_fill_price=PRICE_120,
         type=OrderType.MARKET,
         side=OrderSide.BUY,
         status=OrderStatus.FILLED,
@@ -636,3 +645,14 @@ def test_adding_orders_to_position():
     # The position size should include the new order
     assert position.size == Decimal("15")
     assert len(position.orders) == 2
+
+
+def test_shared_money_keeps_the_amount_it_was_asked_for():
+    assert Money.of(1) is Money.of(Decimal(1)) is Money.of("1")
+    assert Money.of(Decimal("1.00")) is not Money.of(1)
+    assert Money.of(Decimal("1.00")).amount.as_tuple() == Decimal("1.00").as_tuple()
+    assert Money.of(1).amount.as_tuple() == Decimal(1).as_tuple()
+    with pytest.raises(TypeError):
+        Money.of(1.0)
+    with pytest.raises(TypeError):
+        Money.of(True)
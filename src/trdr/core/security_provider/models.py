@@ -1,6 +1,6 @@
 from typing import List, Optional
 from pydantic import BaseModel, model_validator, ConfigDict
-from decimal import Decimal
+from decimal import Decimal, MAX_PREC, localcontext
 
 from ..bar_provider.models import Bar
 from ..shared.models import Money, Timeframe
@@ -52,18 +52,17 @@ class Security(BaseModel):
         if period.is_intraday():
             raise ValueError("Intraday timeframe not supported for average volume computation")
 
-        relevant_bars = self.bars.copy()
         days = period.to_days()
 
-        if len(relevant_bars) < days + offset:
+        if len(self.bars) < days + offset:
             return None
 
         # Calculate the start and end indices for the window
-        end_idx = len(relevant_bars) - offset
+        end_idx = len(self.bars) - offset
         start_idx = end_idx - days
 
         # Sum the volumes for the specified window
-        sum_volumes = sum(bar.volume for bar in relevant_bars[start_idx:end_idx])
+        sum_volumes = sum(bar.volume for bar in self.bars[start_idx:end_idx])
         return sum_volumes // days
 
     def compute_moving_average(self, period: Optional[Timeframe], offset: int = 0) -> Money:
@@ -83,18 +82,18 @@ class Security(BaseModel):
         if period.is_intraday():
             raise ValueError("Intraday timeframe not supported for moving average computation")
 
-        relevant_bars = self.bars.copy()
         days = period.to_days()
 
-        if len(relevant_bars) < days + offset:
+        if len(self.bars) < days + offset:
             return None
 
         # Calculate the start and end indices for the window
-        end_idx = len(relevant_bars) - offset
+        end_idx = len(self.bars) - offset
         start_idx = end_idx - days
 
-        # Sum the closing prices for the specified window
-        sum_prices = sum(bar.close.amount for bar in relevant_bars[start_idx:end_idx])
+        # The window is summed exactly and rounded once, by the division
+        with localcontext(prec=MAX_PREC):
+            sum_prices = sum(bar.close.amount for bar in self.bars[start_idx:end_idx])
         return Money(amount=Decimal(sum_prices / days))
 
     def has_bullish_moving_average_crossover(
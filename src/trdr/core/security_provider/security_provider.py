@@ -4,6 +4,7 @@ from opentelemetry import trace
 from .base_security_provider import BaseSecurityProvider
 from .models import Security
 from ..bar_provider.exceptions import InsufficientBarsException, NoBarsForSymbolException
+from ..shared.tracing import start_span
 
 
 class SecurityProvider(BaseSecurityProvider):
@@ -19,7 +20,7 @@ class SecurityProvider(BaseSecurityProvider):
         pass
 
     async def get_security(self, symbol: str) -> Security:
-        with self._tracer.start_as_current_span("SecurityProvider.get_security") as span:
+        with start_span(self._tracer, "SecurityProvider.get_security") as span:
             span.set_attribute("symbol", symbol)
             try:
                 bars = await self._bar_provider.get_bars(symbol)
@@ -37,7 +38,7 @@ class SecurityProvider(BaseSecurityProvider):
                 return Security(symbol=symbol, bars=bars, current_bar=current_bar)
 
     async def get_symbols(self) -> List[str]:
-        with self._tracer.start_as_current_span("SecurityProvider.get_symbols") as span:
+        with start_span(self._tracer, "SecurityProvider.get_symbols") as span:
             symbols = self._bar_provider.get_symbols()
             span.set_status(trace.StatusCode.OK)
             return symbols
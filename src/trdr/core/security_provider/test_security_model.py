@@ -1,4 +1,5 @@
 import pytest
+from decimal import MAX_PREC, localcontext
 
 from ..security_provider.models import Timeframe
 from ...test_utils.security_generator import SecurityCriteria, Crossover
@@ -14,7 +15,10 @@ def test_compute_average_volume(get_random_security):
 
 def test_compute_moving_average(get_random_security):
     security = get_random_security
-    d5_moving_average = sum(bar.close.amount for bar in security.bars[-5:]) / 5
+    # The window is summed exactly and rounded once, by the division
+    with localcontext(prec=MAX_PREC):
+        d5_sum = sum(bar.close.amount for bar in security.bars[-5:])
+    d5_moving_average = d5_sum / 5
     assert security.compute_moving_average(Timeframe.d5).amount == d5_moving_average
 
 
@@ -52,6 +56,15 @@ def test_bearish_crossover(security_generator):
     assert result is True
 
 
+def test_moving_averages_with_offset_use_the_shifted_window(get_random_security):
+    security = get_random_security
+    with localcontext(prec=MAX_PREC):
+        d20_sum = sum(bar.close.amount for bar in security.bars[-23:-3])
+    assert security.compute_moving_average(Timeframe.d20, offset=3).amount == d20_sum / 20
+    d20_volume = sum(bar.volume for bar in security.bars[-23:-3])
+    assert security.compute_average_volume(Timeframe.d20, offset=3) == d20_volume // 20
+
+
 def test_compute_average_volume_with_offset(get_random_security):
     security = get_random_security
 
@@ -72,3 +85,38 @@ def test_compute_average_volume_zero_days(get_random_security):
 
     with pytest.raises(ValueError):
         security.compute_average_volume(Timeframe.m15)
+
+
+def test_moving_average_follows_reassigned_and_copied_bars(get_random_security):
+    security = get_random_security
+    security.compute_moving_average(Timeframe.d5)
+    security.compute_average_volume(Timeframe.d5)
+
+    # Dropping the oldest bars keeps the latest window but shifts every index the running totals were built on
+    later_bars = security.bars[10:]
+    with localcontext(prec=MAX_PREC):
+        d5_sum = sum(bar.close.amount for bar in later_bars[-5:])
+    d5_moving_average = d5_sum / 5
+    d5_average_volume = sum(bar.volume for bar in later_bars[-5:]) // 5
+
+    copy = security.model_copy(update={"bars": later_bars})
+    assert copy.compute_moving_average(Timeframe.d5).amount == d5_moving_average
+    assert copy.compute_average_volume(Timeframe.d5) == d5_average_volume
+
+    security.bars = later_bars
+    assert security.compute_moving_average(Timeframe.d5).amount == d5_moving_average
+    assert security.compute_average_volume(Timeframe.d5) == d5_average_volume
+    assert security == copy
+
+
+def test_moving_average_follows_a_bar_replaced_in_place(get_random_security):
+    security = get_random_security
+    security.compute_moving_average(Timeframe.d5)
+    security.compute_average_volume(Timeframe.d5)
+
+    security.bars[-1] = security.bars[0]
+    with localcontext(prec=MAX_PREC):
+        d5_sum = sum(bar.close.amount for bar in security.bars[-5:])
+    d5_moving_average = d5_sum / 5
+    assert security.compute_moving_average(Timeframe.d5).amount == d5_moving_average
+    assert security.compute_average_volume(Timeframe.d5) == sum(bar.volume for bar in security.bars[-5:]) // 5
@@ -1,8 +1,10 @@
+import functools
+import math
 from decimal import Decimal
 from datetime import date, datetime, time, timezone, timedelta
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from .exceptions import TradingDateException
 
@@ -15,12 +17,52 @@ class Money(BaseModel):
         currency (str): The currency code, defaults to USD
 
     Methods:
+        of: Returns a shared instance for a commonly used amount
+        from_float: Builds Money from a float price without pydantic validation
         __add__: Adds two Money objects of the same currency
     """
 
+    # Pydantic keeps field values in __dict__; an empty __slots__ just stops each instance carrying a
+    # __weakref__ slot as well.
+    __slots__ = ()
+
+    model_config = ConfigDict(frozen=True)
+
     amount: Decimal
     currency: str | None = "USD"
 
+    @classmethod
+    def of(cls, amount: int | str | Decimal, currency: str = "USD") -> "Money":
+        """Return a shared instance for a commonly used amount.
+
+        Money is immutable, so repeated calls with the same amount can hand back the same object instead of
+        validating a new one. Pass int, str or Decimal amounts; floats are not exact and bools are not amounts.
+
+        Raises:
+            TypeError: If amount is a float or a bool
+        """
+        if isinstance(amount, (float, bool)):
+            raise TypeError(f"Money.of takes an int, str or Decimal amount, got {type(amount).__name__}")
+        # Equal Decimals can differ in exponent (1 and 1.00), so the shared instance is looked up by the amount's
+        # text rather than by the amount itself.
+        return cls._of(str(Decimal(amount)), currency)
+
+    @classmethod
+    @functools.lru_cache(maxsize=128)
+    def _of(cls, amount: str, currency: str) -> "Money":
+        return cls(amount=Decimal(amount), currency=currency)
+
+    @classmethod
+    def from_float(cls, amount: float, currency: str = "USD") -> "Money":
+        """Build Money from a float price feed value, skipping pydantic validation.
+
+        Decimal(float) is exact, so the result equals Money(amount=Decimal(amount)); only non-finite values
+        need rejecting here, as validation would.
+        """
+        if not math.isfinite(amount):
+            raise ValueError(f"Money amount must be finite, got {amount}")
+        return cls.model_construct(amount=Decimal(amount), currency=currency)
+
     def __add__(self, other: "Money") -> "Money":
         """Add two Money objects.
 
@@ -35,21 +77,28 @@ class Money(BaseModel):
         """
         if self.currency != other.currency:
             raise ValueError(f"Cannot add different currencies: {self.currency} and {other.currency}")
-        return Money(amount=self.amount + other.amount, currency=self.currency)
+        # Both operands are already validated, so the result can skip pydantic validation.
+        return Money.model_construct(amount=self.amount + other.amount, currency=self.currency)
 
     def __sub__(self, other: "Money") -> "Money":
         if self.currency != other.currency:
             raise ValueError(f"Cannot subtract different currencies: {self.currency} and {other.currency}")
-        return Money(amount=self.amount - other.amount, currency=self.currency)
+        return Money.model_construct(amount=self.amount - other.amount, currency=self.currency)
 
     def __str__(self) -> str:
         return f"{self.currency} {self.amount:.2f}"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Money):
             return False
         return round(self.amount, 2) == round(other.amount, 2) and self.currency == other.currency
 
+    def __hash__(self) -> int:
+        # Must agree with __eq__, which compares amounts rounded to cents.
+        return hash((round(self.amount, 2), self.currency))
+
 
 class TradingDateTime(BaseModel):
     """Value object representing a point in market time."""
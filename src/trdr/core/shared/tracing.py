@@ -0,0 +1,29 @@
+from contextlib import nullcontext
+from typing import ContextManager
+
+from opentelemetry import trace
+from opentelemetry.trace import NoOpTracer
+
+# Shared, reusable stand-in for start_as_current_span when tracing is disabled. nullcontext holds no state
+# between uses, so one instance can be entered by any number of callers.
+NOOP_SPAN_CONTEXT: ContextManager[trace.Span] = nullcontext(trace.INVALID_SPAN)
+
+
+def start_span(tracer: trace.Tracer, name: str) -> ContextManager[trace.Span]:
+    """
+    Start a span as the current span, skipping span construction entirely for a NoOpTracer.
+
+    With a NoOpTracer, start_as_current_span still builds a non-recording span, a context and a contextvar
+    token on every call. Here the shared NOOP_SPAN_CONTEXT is returned instead, yielding trace.INVALID_SPAN
+    whose set_status / add_event / record_exception calls do nothing.
+
+    Args:
+        tracer: The tracer the caller was configured with
+        name: The span name
+
+    Returns:
+        A context manager yielding the span
+    """
+    if isinstance(tracer, NoOpTracer):
+        return NOOP_SPAN_CONTEXT
+    return tracer.start_as_current_span(name)
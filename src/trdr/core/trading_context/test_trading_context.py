@@ -1,5 +1,5 @@
-import pytest
 import asyncio
+import pytest
 from decimal import Decimal
 from unittest.mock import AsyncMock, patch, MagicMock
 
@@ -30,44 +30,44 @@ def test_trading_context_creation_with_factory_method(mock_trading_context: Trad
     assert set_of_symbols == set(mock_trading_context.security_provider._bar_provider.get_symbols())
 
 
-def test_trading_context_next_symbol(mock_trading_context: TradingContext):
+async def test_trading_context_next_symbol(mock_trading_context: TradingContext):
     """Test advancing to next symbol successfully updates context properties."""
     assert mock_trading_context.current_symbol is None
     assert mock_trading_context.current_position is None
     assert mock_trading_context.current_security is None
 
     # First call to next_symbol
-    result = asyncio.run(mock_trading_context.next_symbol())
+    result = await mock_trading_context.next_symbol()
     assert result is True
 
-    list_of_symbols = asyncio.run(mock_trading_context.security_provider.get_symbols())
+    list_of_symbols = await mock_trading_context.security_provider.get_symbols()
     assert mock_trading_context.current_symbol == list_of_symbols[0]
     # Position may be None if no position exists for this symbol
     assert mock_trading_context.current_security is not None
     assert mock_trading_context.current_security.symbol == mock_trading_context.current_symbol
 
 
-def test_trading_context_process_all_symbols(mock_trading_context: TradingContext):
+async def test_trading_context_process_all_symbols(mock_trading_context: TradingContext):
     """Test processing all symbols and then returning false when complete."""
     # Get total number of symbols
     total_symbols = len(mock_trading_context.symbol_stack)
 
     # Process all symbols
     for i in range(total_symbols):
-        result = asyncio.run(mock_trading_context.next_symbol())
+        result = await mock_trading_context.next_symbol()
         assert result is True
         assert mock_trading_context.current_symbol is not None
         assert mock_trading_context.current_security is not None
 
     # Try one more time - should return False and reset values
-    result = asyncio.run(mock_trading_context.next_symbol())
+    result = await mock_trading_context.next_symbol()
     assert result is False
     assert mock_trading_context.current_symbol is None
     assert mock_trading_context.current_position is None
     assert mock_trading_context.current_security is None
 
 
-def test_trading_context_empty_symbol_list():
+async def test_trading_context_empty_symbol_list():
     """Test behavior with empty symbol list."""
     # Create mocks for dependencies
     mock_security_provider = AsyncMock()
@@ -77,13 +77,13 @@ def test_trading_context_empty_symbol_list():
     mock_security_provider.get_symbols.return_value = []
 
     # Create context with empty symbol list
-    context = asyncio.run(TradingContext.create(mock_security_provider, mock_broker))
+    context = await TradingContext.create(mock_security_provider, mock_broker)
 
     # Verify symbol stack is empty
     assert context.symbol_stack == []
 
     # Try to get next symbol
-    result = asyncio.run(context.next_symbol())
+    result = await context.next_symbol()
 
     # Verify returns False and context values are None
     assert result is False
@@ -92,7 +92,7 @@ def test_trading_context_empty_symbol_list():
     assert context.current_security is None
 
 
-def test_next_symbol_security_symbol_mismatch(mock_trading_context: TradingContext):
+async def test_next_symbol_security_symbol_mismatch(mock_trading_context: TradingContext):
     """Test error when security's symbol doesn't match current symbol."""
     # Create a mock for get_security that returns a mismatched symbol
     original_get_security = mock_trading_context.security_provider.get_security
@@ -108,10 +108,10 @@ def test_next_symbol_security_symbol_mismatch(mock_trading_context: TradingConte
     with patch.object(mock_trading_context.security_provider, "get_security", mock_get_security):
         # Try to get next symbol - should raise ValueError
         with pytest.raises(ValueError, match="Current security symbol does not match current symbol"):
-            asyncio.run(mock_trading_context.next_symbol())
+            await mock_trading_context.next_symbol()
 
 
-def test_next_symbol_position_symbol_mismatch(mock_trading_context: TradingContext):
+async def test_next_symbol_position_symbol_mismatch(mock_trading_context: TradingContext):
     """Test error when position's symbol doesn't match current symbol."""
 
     async def mock_get_position(symbol):
@@ -122,30 +122,58 @@ def test_next_symbol_position_symbol_mismatch(mock_trading_context: TradingConte
     with patch.object(mock_trading_context.broker, "get_position", mock_get_position):
         # Try to get next symbol - should raise ValueError
         with pytest.raises(ValueError, match="Current position symbol does not match current symbol"):
-            asyncio.run(mock_trading_context.next_symbol())
+            await mock_trading_context.next_symbol()
+
+
+@pytest.mark.parametrize("failing_call", ["security", "position"])
+async def test_next_symbol_cancels_the_other_call_when_one_fails(mock_trading_context: TradingContext, failing_call):
+    """Test that a failed position or security lookup cancels the other one and is raised as it is."""
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def failing(symbol):
+        await started.wait()
+        raise RuntimeError("lookup failed")
+
+    async def blocking(symbol):
+        started.set()
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    get_position, get_security = (blocking, failing) if failing_call == "security" else (failing, blocking)
+    with (
+        patch.object(mock_trading_context.broker, "get_position", get_position),
+        patch.object(mock_trading_context.security_provider, "get_security", get_security),
+    ):
+        with pytest.raises(RuntimeError, match="lookup failed"):
+            await asyncio.wait_for(mock_trading_context.next_symbol(), timeout=1)
+    assert cancelled.is_set()
 
 
-def test_get_value_for_identifier_no_current_symbol(mock_trading_context: TradingContext):
+async def test_get_value_for_identifier_no_current_symbol(mock_trading_context: TradingContext):
     """Test error when retrieving value without current symbol set."""
     with pytest.raises(ValueError, match="Current symbol is not set"):
-        asyncio.run(mock_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE))
+        await mock_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE)
 
 
-def test_get_value_for_identifier_no_current_security(mock_trading_context: TradingContext):
+async def test_get_value_for_identifier_no_current_security(mock_trading_context: TradingContext):
     """Test error when retrieving value without current security set."""
     # Set current_symbol but leave current_security as None
     mock_trading_context.current_symbol = "AAPL"
     mock_trading_context.current_security = None
 
     with pytest.raises(ValueError, match="Current security is not set"):
-        asyncio.run(mock_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE))
+        await mock_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE)
 
 
-def test_invalid_context_identifier(prepared_trading_context: TradingContext):
+async def test_invalid_context_identifier(prepared_trading_context: TradingContext):
     """Test passing an invalid identifier."""
     invalid_identifier = "INVALID_IDENTIFIER"
     with pytest.raises(ValueError, match=f"Invalid context identifier"):
-        asyncio.run(prepared_trading_context.get_value_for_identifier(invalid_identifier))
+        await prepared_trading_context.get_value_for_identifier(invalid_identifier)
 
 
 @pytest.mark.parametrize(
@@ -158,17 +186,17 @@ def test_invalid_context_identifier(prepared_trading_context: TradingContext):
         (ContextIdentifier.MA200, Timeframe.d200, False),
     ],
 )
-def test_get_moving_averages(prepared_trading_context: TradingContext, identifier, timeframe, should_succeed):
+async def test_get_moving_averages(prepared_trading_context: TradingContext, identifier, timeframe, should_succeed):
     """Test moving average retrieval behavior."""
     if should_succeed:
         # Test successful case (MA5)
         expected_value = prepared_trading_context.current_security.compute_moving_average(timeframe)
-        value = asyncio.run(prepared_trading_context.get_value_for_identifier(identifier))
+        value = await prepared_trading_context.get_value_for_identifier(identifier)
         assert value == expected_value.amount
     else:
         # Test failure cases (MA20-MA200)
         with pytest.raises(MissingContextValue):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(identifier))
+            await prepared_trading_context.get_value_for_identifier(identifier)
 
 
 @pytest.mark.parametrize(
@@ -181,16 +209,18 @@ def test_get_moving_averages(prepared_trading_context: TradingContext, identifie
         (ContextIdentifier.AV200, Timeframe.d200, False),
     ],
 )
-def test_get_average_volume_identifier(prepared_trading_context: TradingContext, identifier, timeframe, should_succeed):
+async def test_get_average_volume_identifier(
+    prepared_trading_context: TradingContext, identifier, timeframe, should_succeed
+):
     """Test successful retrieval of average volume values."""
     if should_succeed:
         # Test successful case (AV5)
         expected_value = prepared_trading_context.current_security.compute_average_volume(timeframe)
-        value = asyncio.run(prepared_trading_context.get_value_for_identifier(identifier))
+        value = await prepared_trading_context.get_value_for_identifier(identifier)
         assert value == expected_value
     else:
         with pytest.raises(MissingContextValue):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(identifier))
+            await prepared_trading_context.get_value_for_identifier(identifier)
 
 
 @pytest.mark.parametrize(
@@ -203,7 +233,7 @@ def test_get_average_volume_identifier(prepared_trading_context: TradingContext,
         ContextIdentifier.AV200,
     ],
 )
-def test_get_average_volume_none_value(prepared_trading_context: TradingContext, identifier):
+async def test_get_average_volume_none_value(prepared_trading_context: TradingContext, identifier):
     """Test behavior when average volume computation returns None."""
     # Mock the compute_average_volume method to return None
     with patch.object(Security, "compute_average_volume", return_value=None):
@@ -211,22 +241,22 @@ def test_get_average_volume_none_value(prepared_trading_context: TradingContext,
         with pytest.raises(
             MissingContextValue, match=f"Average volume for {prepared_trading_context.current_symbol} is not available"
         ):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(identifier))
+            await prepared_trading_context.get_value_for_identifier(identifier)
 
-def test_get_current_volume(prepared_trading_context: TradingContext):
+async def test_get_current_volume(prepared_trading_context: TradingContext):
     """Test successful retrieval of current volume."""
     # Configure security's current bar to have a volume
     expected_volume = 15000
     prepared_trading_context.current_security.current_bar.volume = expected_volume
 
     # Get the current volume
-    value = asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_VOLUME))
+    value = await prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_VOLUME)
 
     # Verify correct value was returned
     assert value == Decimal(expected_volume)
 
 
-def test_get_current_volume_none_value(prepared_trading_context: TradingContext):
+async def test_get_current_volume_none_value(prepared_trading_context: TradingContext):
     """Test behavior when current_bar.volume is None."""
     # Store original volume to restore later
     original_volume = prepared_trading_context.current_security.current_bar.volume
@@ -239,22 +269,22 @@ def test_get_current_volume_none_value(prepared_trading_context: TradingContext)
         with pytest.raises(
             MissingContextValue, match=f"Current volume for {prepared_trading_context.current_symbol} is not available"
         ):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_VOLUME))
+            await prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_VOLUME)
     finally:
         # Restore original volume
         prepared_trading_context.current_security.current_bar.volume = original_volume
 
 
-def test_get_current_price(prepared_trading_context: TradingContext):
+async def test_get_current_price(prepared_trading_context: TradingContext):
     """Test successful retrieval of current price."""
     # Get the current price
-    value = asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE))
+    value = await prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE)
 
     # Verify correct value was returned - should match the current_bar.close.amount
     assert value == prepared_trading_context.current_security.current_bar.close.amount
 
 
-def test_get_current_price_none_value(prepared_trading_context: TradingContext):
+async def test_get_current_price_none_value(prepared_trading_context: TradingContext):
     """Test behavior when current_bar.close is None."""
     # Store original close price to restore later
     original_close = prepared_trading_context.current_security.current_bar.close
@@ -267,12 +297,12 @@ def test_get_current_price_none_value(prepared_trading_context: TradingContext):
         with pytest.raises(
             MissingContextValue, match=f"Current price for {prepared_trading_context.current_symbol} is not available"
         ):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE))
+            await prepared_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE)
     finally:
         # Restore original close price
         prepared_trading_context.current_security.current_bar.close = original_close
 
-def test_get_account_exposure(prepared_trading_context: TradingContext):
+async def test_get_account_exposure(prepared_trading_context: TradingContext):
     """Test successful retrieval of account exposure."""
     # Configure broker to return a value for account exposure
     expected_exposure = Decimal("0.45")
@@ -282,22 +312,22 @@ def test_get_account_exposure(prepared_trading_context: TradingContext):
         prepared_trading_context.broker, "get_account_exposure", AsyncMock(return_value=expected_exposure)
     ):
         # Get the account exposure
-        value = asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.ACCOUNT_EXPOSURE))
+        value = await prepared_trading_context.get_value_for_identifier(ContextIdentifier.ACCOUNT_EXPOSURE)
 
         # Verify correct value was returned
         assert value == expected_exposure
 
 
-def test_get_account_exposure_none_value(prepared_trading_context: TradingContext):
+async def test_get_account_exposure_none_value(prepared_trading_context: TradingContext):
     """Test behavior when broker returns None for account exposure."""
     # Create a patch for the broker method
     with patch.object(prepared_trading_context.broker, "get_account_exposure", AsyncMock(return_value=None)):
         # Attempt to get the account exposure - should raise MissingContextValue
         with pytest.raises(MissingContextValue, match="Account exposure is not available"):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.ACCOUNT_EXPOSURE))
+            await prepared_trading_context.get_value_for_identifier(ContextIdentifier.ACCOUNT_EXPOSURE)
 
 
-def test_get_number_of_open_positions(prepared_trading_context: TradingContext):
+async def test_get_number_of_open_positions(prepared_trading_context: TradingContext):
     """Test successful retrieval of number of open positions."""
     # Configure broker to return positions
     positions = {"AAPL": MagicMock(), "MSFT": MagicMock(), "GOOG": MagicMock()}
@@ -305,24 +335,22 @@ def test_get_number_of_open_positions(prepared_trading_context: TradingContext):
     # Create a patch for the broker method
     with patch.object(prepared_trading_context.broker, "get_positions", AsyncMock(return_value=positions)):
         # Get the number of open positions
-        value = asyncio.run(
-            prepared_trading_context.get_value_for_identifier(ContextIdentifier.NUMBER_OF_OPEN_POSITIONS)
-        )
+        value = await prepared_trading_context.get_value_for_identifier(ContextIdentifier.NUMBER_OF_OPEN_POSITIONS)
 
         # Verify correct value was returned
         assert value == Decimal(len(positions))
 
 
-def test_get_number_of_open_positions_none_value(prepared_trading_context: TradingContext):
+async def test_get_number_of_open_positions_none_value(prepared_trading_context: TradingContext):
     """Test behavior when broker returns None for positions."""
     # Create a patch for the broker method
     with patch.object(prepared_trading_context.broker, "get_positions", AsyncMock(return_value=None)):
         # Attempt to get the number of open positions - should raise MissingContextValue
         with pytest.raises(MissingContextValue, match="Number of open positions is not available"):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.NUMBER_OF_OPEN_POSITIONS))
+            await prepared_trading_context.get_value_for_identifier(ContextIdentifier.NUMBER_OF_OPEN_POSITIONS)
 
 
-def test_get_available_cash(prepared_trading_context: TradingContext):
+async def test_get_available_cash(prepared_trading_context: TradingContext):
     """Test successful retrieval of available cash."""
     # Configure broker to return a value for available cash
     expected_cash = Money(amount=Decimal("25000.00"))
@@ -330,22 +358,22 @@ def test_get_available_cash(prepared_trading_context: TradingContext):
     # Create a patch for the broker method
     with patch.object(prepared_trading_context.broker, "get_available_cash", AsyncMock(return_value=expected_cash)):
         # Get the available cash
-        value = asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVAILABLE_CASH))
+        value = await prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVAILABLE_CASH)
 
         # Verify correct value was returned
         assert value == expected_cash.amount
 
 
-def test_get_available_cash_none_value(prepared_trading_context: TradingContext):
+async def test_get_available_cash_none_value(prepared_trading_context: TradingContext):
     """Test behavior when broker returns None for available cash."""
     # Create a patch for the broker method
     with patch.object(prepared_trading_context.broker, "get_available_cash", AsyncMock(return_value=None)):
         # Attempt to get the available cash - should raise MissingContextValue
         with pytest.raises(MissingContextValue, match="Available cash is not available"):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVAILABLE_CASH))
+            await prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVAILABLE_CASH)
 
 
-def test_get_average_cost(prepared_trading_context: TradingContext):
+async def test_get_average_cost(prepared_trading_context: TradingContext):
     """Test successful retrieval of average cost from position."""
     # Set up position with average cost
     expected_cost = Money(amount=Decimal("142.50"))
@@ -359,7 +387,7 @@ def test_get_average_cost(prepared_trading_context: TradingContext):
         prepared_trading_context.current_position = position
 
         # Get the average cost
-        value = asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVERAGE_COST))
+        value = await prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVERAGE_COST)
 
         # Verify correct value was returned
         assert value == expected_cost.amount
@@ -368,7 +396,7 @@ def test_get_average_cost(prepared_trading_context: TradingContext):
         prepared_trading_context.current_position = original_position
 
 
-def test_get_average_cost_no_position(prepared_trading_context: TradingContext):
+async def test_get_average_cost_no_position(prepared_trading_context: TradingContext):
     """Test behavior when current_position is None."""
     # Save the original position to restore later
     original_position = prepared_trading_context.current_position
@@ -379,13 +407,13 @@ def test_get_average_cost_no_position(prepared_trading_context: TradingContext):
 
         # Attempt to get the average cost - should raise MissingContextValue
         with pytest.raises(MissingContextValue, match="Average cost is not available as no position is open"):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVERAGE_COST))
+            await prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVERAGE_COST)
     finally:
         # Restore original position
         prepared_trading_context.current_position = original_position
 
 
-def test_get_average_cost_none_value(prepared_trading_context: TradingContext):
+async def test_get_average_cost_none_value(prepared_trading_context: TradingContext):
     """Test behavior when position.average_cost is None."""
     # Set up position with None average cost
     position = MagicMock()
@@ -399,12 +427,12 @@ def test_get_average_cost_none_value(prepared_trading_context: TradingContext):
 
         # Attempt to get the average cost - should raise MissingContextValue
         with pytest.raises(MissingContextValue, match="Average cost is not available"):
-            asyncio.run(prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVERAGE_COST))
+            await prepared_trading_context.get_value_for_identifier(ContextIdentifier.AVERAGE_COST)
     finally:
         # Restore original position
         prepared_trading_context.current_position = original_position
 
-def test_full_workflow_integration(mock_trading_context: TradingContext):
+async def test_full_workflow_integration(mock_trading_context: TradingContext):
     """Test the full workflow of processing symbols and retrieving values."""
     # Get total number of symbols to process (limit to 1 for test performance)
     symbols_to_process = min(1, len(mock_trading_context.symbol_stack))
@@ -412,23 +440,23 @@ def test_full_workflow_integration(mock_trading_context: TradingContext):
     # Process symbols
     for i in range(symbols_to_process):
         # Advance to the next symbol
-        result = asyncio.run(mock_trading_context.next_symbol())
+        result = await mock_trading_context.next_symbol()
         assert result is True
 
         # Test get_value_for_identifier with different identifiers using patches
 
         # Test moving average
         with patch.object(Security, "compute_moving_average", return_value=Money(amount=Decimal("150"))):
-            ma_value = asyncio.run(mock_trading_context.get_value_for_identifier(ContextIdentifier.MA20))
+            ma_value = await mock_trading_context.get_value_for_identifier(ContextIdentifier.MA20)
             assert ma_value == Decimal("150")
 
         # Test average volume
         with patch.object(Security, "compute_average_volume", return_value=50000):
-            av_value = asyncio.run(mock_trading_context.get_value_for_identifier(ContextIdentifier.AV50))
+            av_value = await mock_trading_context.get_value_for_identifier(ContextIdentifier.AV50)
             assert av_value == Decimal("50000")
 
         # Test current price and volume (these should work without patching)
-        close_value = asyncio.run(mock_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE))
+        close_value = await mock_trading_context.get_value_for_identifier(ContextIdentifier.CURRENT_PRICE)
         assert isinstance(close_value, Decimal)
 
         # Test broker-related values
@@ -441,19 +469,17 @@ def test_full_workflow_integration(mock_trading_context: TradingContext):
         ), patch.object(
             mock_trading_context.broker, "get_available_cash", AsyncMock(return_value=Money(amount=Decimal("50000")))
         ):
-            exp_value = asyncio.run(mock_trading_context.get_value_for_identifier(ContextIdentifier.ACCOUNT_EXPOSURE))
+            exp_value = await mock_trading_context.get_value_for_identifier(ContextIdentifier.ACCOUNT_EXPOSURE)
             assert exp_value == Decimal("0.3")
 
-            pos_count = asyncio.run(
-                mock_trading_context.get_value_for_identifier(ContextIdentifier.NUMBER_OF_OPEN_POSITIONS)
-            )
+            pos_count = await mock_trading_context.get_value_for_identifier(ContextIdentifier.NUMBER_OF_OPEN_POSITIONS)
             assert pos_count == Decimal("2")
 
-            cash_value = asyncio.run(mock_trading_context.get_value_for_identifier(ContextIdentifier.AVAILABLE_CASH))
+            cash_value = await mock_trading_context.get_value_for_identifier(ContextIdentifier.AVAILABLE_CASH)
             assert cash_value == Decimal("50000")
 
 
-def test_error_handling_and_recovery(mock_trading_context: TradingContext):
+async def test_error_handling_and_recovery(mock_trading_context: TradingContext):
     """Test that errors are properly handled and context can continue processing."""
     # Get the initial symbols
     symbols = mock_trading_context.symbol_stack.copy()
@@ -472,10 +498,10 @@ def test_error_handling_and_recovery(mock_trading_context: TradingContext):
     with patch.object(mock_trading_context.security_provider, "get_security", mock_get_security):
         # First symbol should cause an error
         with pytest.raises(ValueError, match=f"Simulated error for {symbols[0]}"):
-            asyncio.run(mock_trading_context.next_symbol())
+            await mock_trading_context.next_symbol()
 
         # Next symbol should succeed
-        result = asyncio.run(mock_trading_context.next_symbol())
+        result = await mock_trading_context.next_symbol()
         assert result is True
         assert mock_trading_context.current_symbol == symbols[1]
         assert mock_trading_context.current_security is not None
@@ -1,4 +1,5 @@
-from typing import Type, TypeVar
+import asyncio
+from typing import Optional, Tuple, Type, TypeVar
 from decimal import Decimal
 from opentelemetry import trace
 
@@ -7,10 +8,27 @@ from ..broker.models import Position
 from ..security_provider.base_security_provider import BaseSecurityProvider
 from ..security_provider.models import Security
 from ..shared.models import ContextIdentifier, Timeframe
+from ..shared.tracing import start_span
 from .exceptions import MissingContextValue
 
 T = TypeVar("T", bound="TradingContext")
 
+# Window of each moving-average and average-volume identifier; they share one lookup path apiece.
+_MOVING_AVERAGE_TIMEFRAMES = {
+    ContextIdentifier.MA5: Timeframe.d5,
+    ContextIdentifier.MA20: Timeframe.d20,
+    ContextIdentifier.MA50: Timeframe.d50,
+    ContextIdentifier.MA100: Timeframe.d100,
+    ContextIdentifier.MA200: Timeframe.d200,
+}
+_AVERAGE_VOLUME_TIMEFRAMES = {
+    ContextIdentifier.AV5: Timeframe.d5,
+    ContextIdentifier.AV20: Timeframe.d20,
+    ContextIdentifier.AV50: Timeframe.d50,
+    ContextIdentifier.AV100: Timeframe.d100,
+    ContextIdentifier.AV200: Timeframe.d200,
+}
+
 
 class TradingContext:
     """
@@ -82,7 +100,7 @@ class TradingContext:
         """
         self = cls.__new__(cls)
         TradingContext.__init__(self, security_provider, broker, tracer, _from_create=True)
-        with self._tracer.start_as_current_span("TradingContext.create") as span:
+        with start_span(self._tracer, "TradingContext.create") as span:
             try:
                 await self._initialize()
             except Exception as e:
@@ -101,6 +119,31 @@ class TradingContext:
         """
         self.symbol_stack = await self.security_provider.get_symbols()
 
+    async def _load_position_and_security(self, symbol: str) -> Tuple[Optional[Position], Security]:
+        """
+        Fetch the position and the security for a symbol at the same time.
+
+        The broker and the security provider are independent, so both calls run at once. If either one fails, the
+        other is cancelled and awaited, then the failure is raised as it is. If both fail, the broker's error is
+        raised.
+        """
+        tasks = (
+            asyncio.ensure_future(self.broker.get_position(symbol)),
+            asyncio.ensure_future(self.security_provider.get_security(symbol)),
+        )
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            # A no-op for a finished call; also covers this coroutine itself being cancelled while it waits.
+            for task in tasks:
+                task.cancel()
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise next((error for error in errors if not isinstance(error, asyncio.CancelledError)), errors[0])
+        position, security = results
+        return position, security
+
     async def next_symbol(self) -> bool:
         """
         Advance to the next symbol in the stack and load its associated data.
@@ -114,7 +157,7 @@ class TradingContext:
         Raises:
             ValueError: If there's a symbol mismatch between security and position and current symbol
         """
-        with self._tracer.start_as_current_span("TradingContext.next_symbol") as span:
+        with start_span(self._tracer, "TradingContext.next_symbol") as span:
             span.set_attribute("length_of_symbol_stack", len(self.symbol_stack))
             try:
                 self.current_symbol = self.symbol_stack.pop(0)
@@ -126,8 +169,9 @@ class TradingContext:
                 self.current_security = None
                 return False
             else:
-                self.current_position = await self.broker.get_position(self.current_symbol)
-                self.current_security = await self.security_provider.get_security(self.current_symbol)
+                self.current_position, self.current_security = await self._load_position_and_security(
+                    self.current_symbol
+                )
 
                 if not self.current_security.symbol == self.current_symbol:
                     span.set_status(trace.StatusCode.ERROR)
@@ -169,7 +213,7 @@ class TradingContext:
             ValueError: If the identifier is invalid or current symbol is not set
             MissingContextValue: If the requested value is not available
         """
-        with self._tracer.start_as_current_span("TradingContext.get_value_for_identifier") as span:
+        with start_span(self._tracer, "TradingContext.get_value_for_identifier") as span:
             if not self.current_symbol:
                 error = ValueError("Current symbol is not set when trying to get value for identifier")
                 span.record_exception(error)
@@ -181,79 +225,20 @@ class TradingContext:
 
             match identifier:
 
-                case ContextIdentifier.MA5:
-                    moving_average = self.current_security.compute_moving_average(Timeframe.d5)
-                    if moving_average is None:
-                        error = MissingContextValue(f"Moving average for {self.current_symbol} is not available")
-                        span.add_event(str(error))
-                        raise error
-                    return moving_average.amount
-
-                case ContextIdentifier.MA20:
-                    moving_average = self.current_security.compute_moving_average(Timeframe.d20)
-                    if moving_average is None:
-                        error = MissingContextValue(f"Moving average for {self.current_symbol} is not available")
-                        raise error
-                    return moving_average.amount
-
-                case ContextIdentifier.MA50:
-                    moving_average = self.current_security.compute_moving_average(Timeframe.d50)
-                    if moving_average is None:
-                        error = MissingContextValue(f"Moving average for {self.current_symbol} is not available")
-                        span.add_event(str(error))
-                        raise error
-                    return moving_average.amount
-
-                case ContextIdentifier.MA100:
-                    moving_average = self.current_security.compute_moving_average(Timeframe.d100)
-                    if moving_average is None:
-                        error = MissingContextValue(f"Moving average for {self.current_symbol} is not available")
-                        span.add_event(str(error))
-                        raise error
-                    return moving_average.amount
-
-                case ContextIdentifier.MA200:
-                    moving_average = self.current_security.compute_moving_average(Timeframe.d200)
+                case _ if identifier in _MOVING_AVERAGE_TIMEFRAMES:
+                    moving_average = self.current_security.compute_moving_average(
+                        _MOVING_AVERAGE_TIMEFRAMES[identifier]
+                    )
                     if moving_average is None:
                         error = MissingContextValue(f"Moving average for {self.current_symbol} is not available")
                         span.add_event(str(error))
                         raise error
                     return moving_average.amount
 
-                case ContextIdentifier.AV5:
-                    average_volume = self.current_security.compute_average_volume(Timeframe.d5)
-                    if average_volume is None:
-                        error = MissingContextValue(f"Average volume for {self.current_symbol} is not available")
-                        span.add_event(str(error))
-                        raise error
-                    return Decimal(average_volume)
-
-                case ContextIdentifier.AV20:
-                    average_volume = self.current_security.compute_average_volume(Timeframe.d20)
-                    if average_volume is None:
-                        error = MissingContextValue(f"Average volume for {self.current_symbol} is not available")
-                        span.add_event(str(error))
-                        raise error
-                    return Decimal(average_volume)
-
-                case ContextIdentifier.AV50:
-                    average_volume = self.current_security.compute_average_volume(Timeframe.d50)
-                    if average_volume is None:
-                        error = MissingContextValue(f"Average volume for {self.current_symbol} is not available")
-                        span.add_event(str(error))
-                        raise error
-                    return Decimal(average_volume)
-
-                case ContextIdentifier.AV100:
-                    average_volume = self.current_security.compute_average_volume(Timeframe.d100)
-                    if average_volume is None:
-                        error = MissingContextValue(f"Average volume for {self.current_symbol} is not available")
-                        span.add_event(str(error))
-                        raise error
-                    return Decimal(average_volume)
-
-                case ContextIdentifier.AV200:
-                    average_volume = self.current_security.compute_average_volume(Timeframe.d200)
+                case _ if identifier in _AVERAGE_VOLUME_TIMEFRAMES:
+                    average_volume = self.current_security.compute_average_volume(
+                        _AVERAGE_VOLUME_TIMEFRAMES[identifier]
+                    )
                     if average_volume is None:
                         error = MissingContextValue(f"Average volume for {self.current_symbol} is not available")
                         span.add_event(str(error))